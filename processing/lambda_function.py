@@ -2,127 +2,567 @@ import os
 import sys
 import json
 import logging
+import time
 import boto3
-import pandas as pd
+import orjson
+from boto3.s3.transfer import TransferConfig
+from botocore.config import Config
+import numpy as np
 import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.csv as pacsv
+import pyarrow.json as paj
+import pyarrow.parquet as pq
 import io
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta, timezone
+from itertools import islice
 from models import GameData, Game
-from typing import List, Dict, Any, Optional, Tuple
+from typing import List, Dict, Any, Iterator, Optional, Tuple
 
 logger = logging.getLogger()
 logger.setLevel(logging.INFO)
 
-def validate_and_transform_data(raw_data: List[Dict[Any, Any]]) -> List[Dict[str, Any]]:
-    """Validate and transform raw data using Pydantic models with strict validation"""
-    validated_data = []
+# Number of S3 objects downloaded concurrently by download_objects
+DOWNLOAD_WORKERS = 32
+
+# Shared S3 client, created once per container and reused by every function and by
+# warm invocations. The connection pool is sized for the concurrent downloads in
+# download_objects.
+_S3 = boto3.client(
+    "s3",
+    config=Config(max_pool_connections=DOWNLOAD_WORKERS * 2, retries={'max_attempts': 10, 'mode': 'adaptive'})
+)
+
+# Large outputs are uploaded in 8 MiB parts read straight from the in-memory buffer
+TRANSFER_CONFIG = TransferConfig(
+    multipart_threshold=8 * 1024 * 1024,
+    multipart_chunksize=8 * 1024 * 1024,
+    max_concurrency=8
+)
+
+# Seconds a prefix listing is reused by check_backfill_status. Step Functions poll
+# the status repeatedly and warm containers keep this cache between invocations.
+LIST_CACHE_TTL = 30
+_LIST_CACHE: Dict[Tuple[str, str], Tuple[float, List[str]]] = {}
+
+# Suffixes of the scraper's JSON output files
+JSON_SUFFIXES = ('.json', '.jsonl')
+
+# JMESPath filter selecting the JSON file keys from a ListObjectsV2 page
+JSON_KEYS_QUERY = "Contents[?ends_with(Key, `.json`) || ends_with(Key, `.jsonl`)].Key"
+
+# Fields written by the scraper for each game. Declaring the types up front stops the
+# Arrow JSON reader from inferring different types for the same field across files.
+RAW_GAME_SCHEMA = pa.schema([
+    ('league_name', pa.string()),
+    # Read as text: dates like "Sat-Jun 1" appear alongside ISO ones, and
+    # transform_games_table parses them per row instead of failing the file
+    ('game_date', pa.string()),
+    ('game_time', pa.string()),
+    ('home_team', pa.string()),
+    ('away_team', pa.string()),
+    ('score', pa.string()),
+    ('field', pa.string()),
+    ('game_type', pa.string()),
+])
+
+# Schema of the combined games dataset written by convert_to_parquet
+DATASET_SCHEMA = pa.schema([
+    ('date', pa.timestamp('ns')),
+    ('home_team', pa.string()),
+    ('away_team', pa.string()),
+    ('home_score', pa.int64()),
+    ('away_score', pa.int64()),
+    ('league', pa.string()),
+    ('time', pa.string()),
+    ('url', pa.string()),
+    ('type', pa.string()),
+    ('status', pa.float64()),
+    ('headers', pa.string()),
+    ('timestamp', pa.timestamp('ns'))
+])
+
+# Low-cardinality columns that benefit from dictionary encoding
+DICTIONARY_COLUMNS = ['home_team', 'away_team', 'league', 'status', 'type', 'headers']
+
+# Scraper field names mapped to the dataset column names
+ALTERNATIVE_FIELD_MAP = {
+    'league_name': 'league',
+    'game_date': 'date',
+    'game_time': 'time',
+    'game_type': 'type',
+}
+
+def read_json_table(data: bytes) -> pa.Table:
+    """Parse a JSON Lines file (or a JSON array / object) into an Arrow table
+
+    The bytes are wrapped in a zero-copy BufferReader rather than copied into a
+    BytesIO, and are kept around for the JSON array fallback.
+    """
+    try:
+        return paj.read_json(
+            pa.BufferReader(data),
+            parse_options=paj.ParseOptions(
+                explicit_schema=RAW_GAME_SCHEMA,
+                unexpected_field_behavior='infer'
+            )
+        )
+    except pa.ArrowInvalid:
+        # The scraper writes each day's games as a single JSON array. Anything that
+        # isn't one document is JSON Lines the reader rejected, parsed line by line
+        try:
+            records = orjson.loads(data)
+        except orjson.JSONDecodeError:
+            records = [orjson.loads(line) for line in bytes(data).splitlines() if line.strip()]
+        if isinstance(records, dict):
+            records = [records]
+        return records_to_table(records)
+
+def records_to_table(records: List[Dict[str, Any]]) -> pa.Table:
+    """Build an Arrow table from dicts, inferring columns from every record"""
+    if not records:
+        return pa.table({})
+    return pa.Table.from_struct_array(pa.array(records))
+
+def parse_scores(scores: pa.ChunkedArray) -> Tuple[pa.ChunkedArray, pa.ChunkedArray]:
+    """Split scores like "7 - 2" into home and away integer arrays (null when unparseable)"""
+    # A single regex pass captures both sides; rows that don't match come back null
+    parts = pc.extract_regex(scores, pattern=r'^\s*(?P<home>\d+)\s* - \s*(?P<away>\d+)\s*$')
+    home_score = pc.cast(pc.struct_field(parts, 'home'), pa.int64())
+    away_score = pc.cast(pc.struct_field(parts, 'away'), pa.int64())
+    return home_score, away_score
+
+def standardize_games_table(table: pa.Table) -> pa.Table:
+    """Map scraper field names to dataset columns and split the score column"""
+    names = [ALTERNATIVE_FIELD_MAP.get(name, name) for name in table.column_names]
+    table = table.rename_columns(names)
+
+    if 'score' in table.column_names:
+        home_score, away_score = parse_scores(table['score'])
+        table = table.drop(['score'])
+        table = table.append_column('home_score', home_score)
+        table = table.append_column('away_score', away_score)
+
+    return table
+
+def cast_or_reject(values: pa.ChunkedArray, target_type: pa.DataType) -> Tuple[pa.ChunkedArray, Optional[pa.ChunkedArray]]:
+    """Cast a column. If the cast fails, return nulls and a mask that accepts only null inputs"""
+    try:
+        return pc.cast(values, target_type), None
+    except (pa.ArrowInvalid, pa.ArrowNotImplementedError):
+        return pa.chunked_array([pa.nulls(len(values), target_type)]), pc.is_null(values)
+
+def transform_games_table(table: pa.Table) -> Tuple[pa.Table, pa.Table]:
+    """Coerce a standardized games table to DATASET_SCHEMA with vectorized checks.
+
+    Mirrors the rules of the Game / GameData models. Returns the rows that pass
+    and the untouched rows that do not, so callers can retry the rejected rows
+    through validate_to_table (e.g. dates like "Sat-Jun 1").
+    """
+    num_rows = table.num_rows
+
+    def column(name: str) -> pa.ChunkedArray:
+        if name in table.column_names:
+            return table[name]
+        return pa.chunked_array([pa.nulls(num_rows)])
+
+    columns = {}
+    checks = []
+
+    # Team and league names are required and stripped
+    for name in ('home_team', 'away_team', 'league'):
+        values, _ = cast_or_reject(column(name), pa.string())
+        values = pc.utf8_trim_whitespace(values)
+        columns[name] = values
+        checks.append(pc.fill_null(pc.greater(pc.utf8_length(values), 0), False))
+
+    # Dates are required; plain YYYY-MM-DD strings are parsed here
+    date_values = column('date')
+    if pa.types.is_string(date_values.type) or pa.types.is_large_string(date_values.type):
+        date_values = pc.strptime(date_values, format='%Y-%m-%d', unit='ns', error_is_null=True)
+    else:
+        date_values, _ = cast_or_reject(date_values, pa.timestamp('ns'))
+    columns['date'] = date_values
+    checks.append(pc.is_valid(date_values))
+
+    # Scores are optional but must be non-negative integers when present
+    for name in ('home_score', 'away_score'):
+        values, accepted = cast_or_reject(column(name), pa.int64())
+        columns[name] = values
+        checks.append(accepted)
+        checks.append(pc.fill_null(pc.greater_equal(values, 0), True))
+
+    for name in ('time', 'type', 'headers'):
+        values, accepted = cast_or_reject(column(name), pa.string())
+        columns[name] = values
+        checks.append(accepted)
+
+    # URLs are optional but must be absolute http(s) links when present
+    url_values, accepted = cast_or_reject(column('url'), pa.string())
+    columns['url'] = url_values
+    checks.append(accepted)
+    checks.append(pc.fill_null(pc.or_(
+        pc.starts_with(url_values, 'http://'),
+        pc.starts_with(url_values, 'https://')
+    ), True))
+
+    # Status is an optional fraction between 0 and 1
+    status_values, accepted = cast_or_reject(column('status'), pa.float64())
+    columns['status'] = status_values
+    checks.append(accepted)
+    checks.append(pc.fill_null(pc.and_(
+        pc.greater_equal(status_values, 0),
+        pc.less_equal(status_values, 1)
+    ), True))
+
+    # Missing timestamps default to the processing time (UTC, timezone-naive)
+    timestamp_values, accepted = cast_or_reject(column('timestamp'), pa.timestamp('ns'))
+    now = pa.scalar(datetime.now(timezone.utc).replace(tzinfo=None), type=pa.timestamp('ns'))
+    columns['timestamp'] = pc.if_else(pc.is_null(timestamp_values), now, timestamp_values)
+    checks.append(accepted)
+
+    passed = checks[0]
+    for check in checks[1:]:
+        if check is not None:
+            passed = pc.and_(passed, check)
+
+    transformed = pa.table(
+        [columns[field.name] for field in DATASET_SCHEMA],
+        schema=DATASET_SCHEMA
+    )
+    return transformed.filter(passed), table.filter(pc.invert(passed))
+
+def normalize_records(raw_data: List[Dict[Any, Any]]) -> List[Dict[str, Any]]:
+    """Flatten raw records to one dict per game using dataset field names.
+
+    Handles the standard format (games nested under a date), the alternative
+    format written by the scraper (league_name, game_date, ...) and records that
+    are already flat. Values are not parsed or validated here.
+    """
+    records = []
 
     for record in raw_data:
+        if 'games' in record:
+            # Handle case where games might be a single game or a list
+            games = record.get('games') or []
+            if not isinstance(games, list):
+                games = [games]
+
+            for game in games:
+                if isinstance(game, dict):
+                    records.append({
+                        **game,
+                        'date': record.get('date'),
+                        'url': record.get('url'),
+                        'type': record.get('type'),
+                        'status': record.get('status'),
+                        'headers': record.get('headers'),
+                        'timestamp': record.get('timestamp')
+                    })
+        else:
+            records.append({ALTERNATIVE_FIELD_MAP.get(key, key): value for key, value in record.items()})
+
+    return records
+
+def validate_games(raw_data: List[Dict[Any, Any]]) -> List[GameData]:
+    """Validate raw records with the Pydantic models, dropping (and logging) invalid ones"""
+    records = normalize_records(raw_data)
+    if not records:
+        return []
+
+    # Parse "7 - 2" style scores for the whole batch in one vectorized pass
+    raw_scores = pa.chunked_array([pa.array(
+        [record.get('score') if isinstance(record.get('score'), str) else None for record in records],
+        type=pa.string()
+    )])
+    home_scores, away_scores = parse_scores(raw_scores)
+
+    unparsed_scores = pc.sum(pc.and_(
+        pc.greater(pc.utf8_length(pc.utf8_trim_whitespace(raw_scores)), 0),
+        pc.is_null(home_scores)
+    )).as_py() or 0
+    if unparsed_scores:
+        logger.warning(f"Could not parse {unparsed_scores} scores")
+
+    validated_data = []
+    invalid_records = 0
+    error_samples = []
+
+    for record, home_score, away_score in zip(records, home_scores.to_pylist(), away_scores.to_pylist()):
+        if 'score' in record:
+            home_score_value, away_score_value = home_score, away_score
+        else:
+            home_score_value, away_score_value = record.get('home_score'), record.get('away_score')
+
         try:
-            # Check if we have the alternative format (with league_name, game_date, etc.)
-            if 'league_name' in record and 'game_date' in record:
+            game = Game(
+                home_team=record.get('home_team', ''),
+                away_team=record.get('away_team', ''),
+                home_score=home_score_value,
+                away_score=away_score_value,
+                league=record.get('league', ''),
+                time=record.get('time')
+            )
+
+            game_data = GameData(
+                date=record.get('date'),
+                games=game,
+                url=record.get('url'),
+                type=record.get('type'),
+                status=record.get('status'),
+                headers=record.get('headers'),
+                timestamp=record.get('timestamp') or datetime.now(timezone.utc)
+            )
+
+            validated_data.append(game_data)
+        except Exception as e:
+            invalid_records += 1
+            if len(error_samples) < 10:
+                error_samples.append(str(e))
+
+    if invalid_records:
+        logger.warning(
+            "validation: %d of %d records invalid; samples=%r",
+            invalid_records, len(records), error_samples
+        )
+
+    return validated_data
+
+def validate_and_transform_data(raw_data: List[Dict[Any, Any]]) -> List[Dict[str, Any]]:
+    """Validate and transform raw data using Pydantic models with strict validation"""
+    return [game_data.to_dict() for game_data in validate_games(raw_data)]
+
+def validate_to_table(raw_data: List[Dict[Any, Any]]) -> pa.Table:
+    """Validate raw records and build a DATASET_SCHEMA table column by column"""
+    columns = {name: [] for name in DATASET_SCHEMA.names}
+    for game_data in validate_games(raw_data):
+        game_data.to_columns(columns)
+    return pa.Table.from_pydict(columns, schema=DATASET_SCHEMA)
+
+def normalize_timestamp_columns(table: pa.Table) -> pa.Table:
+    """Cast the date and timestamp columns to timezone-naive timestamp('ns')
+
+    Timezone-aware values are converted to UTC. Strings that cannot be parsed
+    become null, as with pd.to_datetime(errors='coerce').
+    """
+    for name in ('date', 'timestamp'):
+        if name not in table.column_names:
+            continue
+
+        values = table[name]
+        if pa.types.is_timestamp(values.type) or pa.types.is_date(values.type):
+            values = pc.cast(values, pa.timestamp('ns'))
+        else:
+            for target_type in (pa.timestamp('ns'), pa.timestamp('ns', tz='UTC')):
                 try:
-                    # Parse the score field if it exists (format like "7 - 2")
-                    home_score = None
-                    away_score = None
-                    if 'score' in record and record['score'] and ' - ' in record['score']:
-                        try:
-                            score_parts = record['score'].split(' - ')
-                            if len(score_parts) == 2:
-                                home_score = int(score_parts[0].strip())
-                                away_score = int(score_parts[1].strip())
-                        except (ValueError, IndexError):
-                            logger.warning(f"Could not parse score: {record.get('score')}")
-
-                    # Create Game object with field mapping
-                    game = Game(
-                        home_team=record.get('home_team', ''),
-                        away_team=record.get('away_team', ''),
-                        home_score=home_score,
-                        away_score=away_score,
-                        league=record.get('league_name', ''),
-                        time=record.get('game_time')
-                    )
-
-                    # Create GameData instance
-                    game_data = GameData(
-                        date=record['game_date'],
-                        games=game,
-                        url=record.get('url'),
-                        type=record.get('game_type'),
-                        status=record.get('status'),
-                        headers=record.get('headers'),
-                        timestamp=record.get('timestamp', datetime.now(timezone.utc))
-                    )
-
-                    # Convert to flat dictionary structure
-                    validated_data.append(game_data.to_dict())
-                except Exception as e:
-                    logger.warning(f"Invalid alternative format game data: {str(e)}")
+                    values = pc.cast(pc.cast(values, target_type), pa.timestamp('ns'))
+                    break
+                except (pa.ArrowInvalid, pa.ArrowNotImplementedError):
                     continue
             else:
-                # Handle case where games might be a list
-                games = record.get('games', [])
-                if not isinstance(games, list):
-                    games = [games]
-
-                # Process each game in the record
-                for game in games:
-                    if game is not None:
-                        try:
-                            # Create GameData instance with strict validation
-                            game_data = GameData(
-                                date=record['date'],
-                                games=Game(**game),
-                                url=record.get('url'),
-                                type=record.get('type'),
-                                status=record.get('status'),
-                                headers=record.get('headers'),
-                                timestamp=record.get('timestamp', datetime.now(timezone.utc))
-                            )
-                            # Convert to flat dictionary structure
-                            validated_data.append(game_data.to_dict())
-                        except Exception as e:
-                            logger.warning(f"Invalid game data: {str(e)}")
-                            continue
+                values = pc.strptime(values, format='%Y-%m-%dT%H:%M:%SZ', unit='ns', error_is_null=True)
 
+        table = table.set_column(table.schema.get_field_index(name), name, values)
+
+    return table
+
+def conform_to_dataset_schema(table: pa.Table) -> pa.Table:
+    """Cast a table to DATASET_SCHEMA, adding null columns for any that are missing"""
+    table = normalize_timestamp_columns(table)
+    columns = [
+        table[field.name] if field.name in table.column_names else pa.nulls(table.num_rows, field.type)
+        for field in DATASET_SCHEMA
+    ]
+    return pa.Table.from_arrays(columns, names=DATASET_SCHEMA.names).cast(DATASET_SCHEMA)
+
+def deduplicate_latest(table: pa.Table, keys: List[str]) -> pa.Table:
+    """Keep only the most recent row (by timestamp) for each combination of key columns
+
+    Key columns missing from the table are ignored. Null key values are treated
+    as equal, as with pandas drop_duplicates.
+    """
+    keys = [key for key in keys if key in table.column_names]
+    if not keys or table.num_rows == 0:
+        return table
+
+    # Rank rows newest first so the lowest rank in each group is the one to keep.
+    # Only the key columns are reordered; the full table is taken once at the end.
+    if 'timestamp' in table.column_names:
+        order = pc.sort_indices(table, sort_keys=[('timestamp', 'descending')])
+    else:
+        order = pa.array(np.arange(table.num_rows))
+
+    ranked = table.select(keys).take(order).append_column('_rank', pa.array(np.arange(table.num_rows)))
+    first_ranks = ranked.group_by(keys).aggregate([('_rank', 'min')])['_rank_min']
+    return table.take(pc.take(order, pc.take(first_ranks, pc.sort_indices(first_ranks))))
+
+def iter_objects(bucket: str, keys: List[str]) -> Iterator[Tuple[str, Optional[bytes], Optional[Exception]]]:
+    """Download S3 objects concurrently, yielding (key, data, error) for each key in order
+
+    At most DOWNLOAD_WORKERS downloads are in flight or waiting to be yielded, and
+    the next key is only submitted once a result has been yielded, so callers that
+    reduce the bytes as they go never hold more than that many files at once.
+    """
+    def download(key: str) -> Tuple[str, Optional[bytes], Optional[Exception]]:
+        try:
+            obj_response = _S3.get_object(Bucket=bucket, Key=key)
+            return key, obj_response['Body'].read(), None
         except Exception as e:
-            logger.warning(f"Invalid record: {str(e)}")
-            continue
+            return key, None, e
+
+    # Downloads are network bound, so keep many requests in flight at once
+    remaining = iter(keys)
+    with ThreadPoolExecutor(max_workers=max(1, min(DOWNLOAD_WORKERS, len(keys)))) as executor:
+        in_flight = deque(executor.submit(download, key) for key in islice(remaining, DOWNLOAD_WORKERS))
+        while in_flight:
+            yield in_flight.popleft().result()
+            key = next(remaining, None)
+            if key is not None:
+                in_flight.append(executor.submit(download, key))
+
+def download_objects(bucket: str, keys: List[str]) -> List[Tuple[str, Optional[bytes], Optional[Exception]]]:
+    """Download S3 objects concurrently, returning (key, data, error) for each key in order"""
+    return list(iter_objects(bucket, keys))
+
+def read_downloaded_file(download: Tuple[str, Optional[bytes], Optional[Exception]]) -> Tuple[str, Optional[pa.Table], Optional[Exception]]:
+    """Parse one (key, data, error) download into a table, returning (key, table, error)"""
+    key, data, error = download
+    if error:
+        return key, None, error
+    try:
+        return key, read_json_table(data), None
+    except Exception as e:
+        return key, None, e
 
-    return validated_data
+def read_json_tables(downloads: List[Tuple[str, Optional[bytes], Optional[Exception]]]) -> List[Tuple[str, Optional[pa.Table], Optional[Exception]]]:
+    """Parse downloaded JSON files in parallel, keeping the download order
+
+    Threads rather than processes: Lambda has no /dev/shm for the semaphores a
+    process pool needs, and the Arrow JSON reader releases the GIL while parsing.
+    """
+    with ThreadPoolExecutor(max_workers=max(1, min(os.cpu_count() or 1, len(downloads)))) as executor:
+        return list(executor.map(read_downloaded_file, downloads))
 
-def get_existing_dataset(bucket: str, key: str) -> pd.DataFrame:
-    """Get the existing dataset from S3 if it exists, otherwise return an empty DataFrame"""
-    s3 = boto3.client("s3")
+def read_parquet_columns(data: bytes, columns: List[str]) -> pa.Table:
+    """Read the requested columns that exist in a Parquet file held in memory
+
+    Parquet needs random access, which the S3 streaming body doesn't offer, so the
+    bytes are wrapped in a zero-copy BufferReader. Columns not requested are
+    skipped using the footer metadata without being decoded.
+    """
+    parquet_file = pq.ParquetFile(pa.BufferReader(data))
+    available = set(parquet_file.schema_arrow.names)
+    return parquet_file.read(columns=[name for name in columns if name in available])
+
+def write_parquet(table: pa.Table) -> io.BytesIO:
+    """Write a table to an in-memory Parquet file using the dataset's encoding settings"""
+    buffer = io.BytesIO()
+    pq.write_table(
+        table,
+        buffer,
+        compression='zstd',
+        compression_level=3,
+        use_dictionary=DICTIONARY_COLUMNS,
+        row_group_size=256_000,
+        data_page_size=1 << 20,
+        write_statistics=True
+    )
+    buffer.seek(0)
+    return buffer
+
+def _format_timestamps(values: pa.ChunkedArray) -> pa.ChunkedArray:
+    """Format a timestamp column as pandas to_csv did: dates only when every value is
+    midnight, otherwise to the finest sub-second unit any value needs"""
+    if pc.all(pc.equal(pc.floor_temporal(values, unit='day'), values)).as_py() is not False:
+        return pc.strftime(values, format='%Y-%m-%d')
+    unit = 'ns'
+    for candidate, temporal_unit in (('s', 'second'), ('ms', 'millisecond'), ('us', 'microsecond')):
+        if pc.all(pc.equal(pc.floor_temporal(values, unit=temporal_unit), values)).as_py() is not False:
+            unit = candidate
+            break
+    # %S prints the fractional digits of the timestamp's unit
+    return pc.strftime(pc.cast(values, pa.timestamp(unit)), format='%Y-%m-%d %H:%M:%S')
+
+def _format_floats(values: pa.ChunkedArray) -> pa.ChunkedArray:
+    """Format a float column as pandas to_csv did: whole numbers keep a trailing .0
+    and NaN is left empty"""
+    values = pc.if_else(pc.is_nan(values), pa.scalar(None, values.type), values)
+    whole = pc.and_(pc.equal(pc.floor(values), values), pc.less(pc.abs(values), 1e16))
+    return pc.if_else(
+        whole,
+        pc.binary_join_element_wise(pc.cast(pc.cast(values, pa.int64(), safe=False), pa.string()), '.0', ''),
+        pc.cast(values, pa.string())
+    )
+
+def write_csv(table: pa.Table) -> io.BytesIO:
+    """Write a table to an in-memory CSV file with the values pandas to_csv produced
+
+    Timestamps and floats are formatted as pandas did, including integer columns with
+    nulls, which pandas wrote as floats; Arrow's writer then quotes every string.
+    """
+    columns = []
+    for field in table.schema:
+        values = table[field.name]
+        if pa.types.is_timestamp(field.type):
+            values = _format_timestamps(values)
+        elif pa.types.is_integer(field.type) and values.null_count:
+            values = _format_floats(pc.cast(values, pa.float64()))
+        elif pa.types.is_floating(field.type):
+            values = _format_floats(values)
+        columns.append(values)
+
+    buffer = io.BytesIO()
+    pacsv.write_csv(pa.table(columns, names=table.column_names), buffer)
+    buffer.seek(0)
+    return buffer
+
+def get_existing_dataset(bucket: str, key: str) -> pa.Table:
+    """Get the existing dataset from S3 if it exists, otherwise return an empty table"""
     try:
         logger.info(f"Attempting to read existing dataset from s3://{bucket}/{key}")
-        obj_response = s3.get_object(Bucket=bucket, Key=key)
-        buffer = io.BytesIO(obj_response['Body'].read())
-
-        # Read the existing Parquet file
-        df = pd.read_parquet(buffer)
-        logger.info(f"Successfully read existing dataset with {len(df)} rows")
-        return df
-    except s3.exceptions.NoSuchKey:
+        obj_response = _S3.get_object(Bucket=bucket, Key=key)
+
+        # Only decode the dataset columns; anything else in older files is skipped
+        table = conform_to_dataset_schema(
+            read_parquet_columns(obj_response['Body'].read(), DATASET_SCHEMA.names)
+        )
+        logger.info(f"Successfully read existing dataset with {table.num_rows} rows")
+        return table
+    except _S3.exceptions.NoSuchKey:
         logger.info(f"No existing dataset found at s3://{bucket}/{key}, starting with empty dataset")
-        return pd.DataFrame()
+        return DATASET_SCHEMA.empty_table()
     except Exception as e:
         logger.warning(f"Error reading existing dataset: {str(e)}, starting with empty dataset")
-        return pd.DataFrame()
+        return DATASET_SCHEMA.empty_table()
+
+def backup_object(bucket: str, key: str, backup_key: str) -> None:
+    """Copy an object to backup_key server-side, doing nothing if it doesn't exist"""
+    try:
+        _S3.head_object(Bucket=bucket, Key=key)
+        logger.info("Creating backup of existing Parquet file")
+        _S3.copy_object(
+            Bucket=bucket,
+            CopySource={'Bucket': bucket, 'Key': key},
+            Key=backup_key
+        )
+    except _S3.exceptions.ClientError as e:
+        if e.response['Error']['Code'] != '404':
+            raise
+        logger.info("No existing Parquet file to backup")
 
 def get_last_processed_timestamp(bucket: str, prefix: str) -> Optional[datetime]:
     """
     Get the timestamp of the last successful processing run
     Uses a marker file in S3 to track when processing was last completed
     """
-    s3 = boto3.client("s3")
     marker_key = f"{prefix.rstrip('/')}/last_processed.json"
 
     try:
         logger.info(f"Checking for last processed timestamp at s3://{bucket}/{marker_key}")
-        response = s3.get_object(Bucket=bucket, Key=marker_key)
-        data = json.loads(response['Body'].read().decode('utf-8'))
+        response = _S3.get_object(Bucket=bucket, Key=marker_key)
+        data = orjson.loads(response['Body'].read())
         timestamp_str = data.get('timestamp')
 
         if timestamp_str:
@@ -139,7 +579,7 @@ def get_last_processed_timestamp(bucket: str, prefix: str) -> Optional[datetime]
             logger.info(f"Last processing run was at {last_processed}")
             return last_processed
 
-    except s3.exceptions.NoSuchKey:
+    except _S3.exceptions.NoSuchKey:
         logger.info(f"No last processed timestamp found at s3://{bucket}/{marker_key}")
     except Exception as e:
         logger.warning(f"Error getting last processed timestamp: {str(e)}")
@@ -155,7 +595,6 @@ def update_last_processed_timestamp(bucket: str, prefix: str) -> None:
     Update the timestamp of the last successful processing run
     Creates or updates a marker file in S3
     """
-    s3 = boto3.client("s3")
     marker_key = f"{prefix.rstrip('/')}/last_processed.json"
 
     now = datetime.now(timezone.utc)
@@ -166,10 +605,10 @@ def update_last_processed_timestamp(bucket: str, prefix: str) -> None:
 
     try:
         logger.info(f"Updating last processed timestamp to {now}")
-        s3.put_object(
+        _S3.put_object(
             Bucket=bucket,
             Key=marker_key,
-            Body=json.dumps(data),
+            Body=orjson.dumps(data),
             ContentType='application/json'
         )
         logger.info(f"Successfully updated last processed timestamp")
@@ -190,7 +629,6 @@ def convert_to_parquet(src_bucket, files, dst_bucket, dst_prefix, version: Optio
         Dictionary with operation results
     """
     logger.info(f"Converting {len(files)} JSON files to Parquet")
-    s3 = boto3.client("s3")
 
     # Use provided version or generate a timestamp
     if not version:
@@ -203,27 +641,28 @@ def convert_to_parquet(src_bucket, files, dst_bucket, dst_prefix, version: Optio
 
     try:
         # Process each JSON file
-        all_validated_data = []
+        raw_tables: Dict[pa.DataType, List[pa.Table]] = {}
+        nested_records = []
         validation_errors = []
 
-        for key in files:
-            logger.info(f"Processing {key}")
-            try:
-                # Read JSON file from S3
-                obj_response = s3.get_object(Bucket=src_bucket, Key=key)
-                data = obj_response['Body'].read()
-
-                # Try reading as JSON Lines first
-                try:
-                    raw_data = pd.read_json(io.BytesIO(data), lines=True).to_dict('records')
-                except ValueError:
-                    # Fallback to standard JSON array
-                    raw_data = pd.read_json(io.BytesIO(data)).to_dict('records')
+        # Fetch the files concurrently, then parse them on every core
+        parsed_files = read_json_tables(download_objects(src_bucket, files))
 
-                # Validate and transform the data
-                validated_data = validate_and_transform_data(raw_data)
-                all_validated_data.extend(validated_data)
-                logger.info(f"Successfully processed {key}, valid records: {len(validated_data)}")
+        records_read = 0
+        for key, table, error in parsed_files:
+            try:
+                if error:
+                    raise error
+
+                if 'games' in table.column_names:
+                    # Standard format with games nested under each date
+                    nested_records.extend(normalize_records(table.to_pylist()))
+                elif table.num_rows:
+                    # game_date is a string unless a file has none; only tables
+                    # of the same kind are concatenated
+                    date_type = table.schema.field('game_date').type if 'game_date' in table.column_names else pa.null()
+                    raw_tables.setdefault(date_type, []).append(table)
+                records_read += table.num_rows
 
             except Exception as e:
                 error_msg = f"Error processing {key}: {str(e)}"
@@ -231,7 +670,38 @@ def convert_to_parquet(src_bucket, files, dst_bucket, dst_prefix, version: Optio
                 validation_errors.append(error_msg)
                 continue
 
-        if not all_validated_data:
+        logger.info(
+            "Read %d of %d files, records=%d",
+            len(files) - len(validation_errors), len(files), records_read
+        )
+
+        # Stitch the per-file tables together once and map fields in bulk
+        staged_tables = []
+        for tables in raw_tables.values():
+            staged_tables.append(
+                standardize_games_table(pa.concat_tables(tables, promote_options='permissive'))
+            )
+        if nested_records:
+            staged_tables.append(records_to_table(nested_records))
+
+        valid_tables = []
+        invalid_records = 0
+        for staged_table in staged_tables:
+            valid_table, rejected_table = transform_games_table(staged_table)
+            valid_tables.append(valid_table)
+
+            if rejected_table.num_rows:
+                # Retry the rows the vectorized checks rejected through the Pydantic models
+                rescued_table = validate_to_table(rejected_table.to_pylist())
+                if rescued_table.num_rows:
+                    valid_tables.append(rescued_table)
+                invalid_records += rejected_table.num_rows - rescued_table.num_rows
+
+        if invalid_records:
+            logger.warning("Dropped %d invalid game records", invalid_records)
+
+        new_table = pa.concat_tables(valid_tables) if valid_tables else DATASET_SCHEMA.empty_table()
+        if not new_table.num_rows:
             logger.warning("No valid records were processed")
             return {
                 "status": "WARNING",
@@ -239,135 +709,49 @@ def convert_to_parquet(src_bucket, files, dst_bucket, dst_prefix, version: Optio
                 "validation_errors": validation_errors
             }
 
-        # Convert new data to DataFrame
-        logger.info("Creating DataFrame from new data")
-        new_df = pd.DataFrame(all_validated_data)
-        logger.info(f"New data DataFrame shape: {new_df.shape}")
+        logger.info(f"New data rows: {new_table.num_rows}")
 
         # Get existing dataset
         current_key = f"{dst_prefix}data.parquet"
-        existing_df = get_existing_dataset(dst_bucket, current_key)
-
-        # Define PyArrow schema with updated timestamp handling
-        schema = pa.schema([
-            ('date', pa.timestamp('ns')),  # Make timestamp nullable
-            ('home_team', pa.string()),
-            ('away_team', pa.string()),
-            ('home_score', pa.int64()),
-            ('away_score', pa.int64()),
-            ('league', pa.string()),
-            ('time', pa.string()),
-            ('url', pa.string()),
-            ('type', pa.string()),
-            ('status', pa.float64()),
-            ('headers', pa.string()),
-            ('timestamp', pa.timestamp('ns'))
-        ])
-
-        # If we have new data, combine with existing
-        if not new_df.empty:
-            if not existing_df.empty:
-                # Create composite key for deduplication
-                logger.info("Combining existing data with new data and deduplicating")
-                existing_df['composite_key'] = existing_df.apply(
-                    lambda x: f"{x['date']}_{x['home_team']}_{x['away_team']}_{x['league']}", axis=1
-                )
-                new_df['composite_key'] = new_df.apply(
-                    lambda x: f"{x['date']}_{x['home_team']}_{x['away_team']}_{x['league']}", axis=1
-                )
-
-                # Combine datasets, keeping the most recent version of each record
-                combined_df = pd.concat([existing_df, new_df])
-                combined_df = combined_df.sort_values('timestamp', ascending=False)
-                combined_df = combined_df.drop_duplicates(subset='composite_key', keep='first')
-                combined_df = combined_df.drop(columns=['composite_key'])
-                logger.info(f"Combined DataFrame shape after deduplication: {combined_df.shape}")
-            else:
-                logger.info("No existing data, using only new data")
-                combined_df = new_df
+        existing_table = get_existing_dataset(dst_bucket, current_key)
+
+        # Combine with existing data, keeping the most recent version of each record
+        if existing_table.num_rows:
+            logger.info("Combining existing data with new data and deduplicating")
+            combined_table = deduplicate_latest(
+                pa.concat_tables([existing_table, new_table]),
+                ['date', 'home_team', 'away_team', 'league']
+            )
+            logger.info(f"Combined rows after deduplication: {combined_table.num_rows}")
         else:
-            logger.info("No new data to add, using existing data")
-            combined_df = existing_df
-
-        if combined_df.empty:
-            logger.warning("No data to write")
-            return {
-                "status": "WARNING",
-                "message": "No data to write",
-                "validation_errors": validation_errors
-            }
-
-        # Backup the existing file if it exists
-        try:
-            backup_key = f"{dst_prefix}data.backup.parquet"
-            s3.head_object(Bucket=dst_bucket, Key=current_key)
-            logger.info("Creating backup of existing Parquet file")
-            s3.copy_object(
-                Bucket=dst_bucket,
-                CopySource={'Bucket': dst_bucket, 'Key': current_key},
-                Key=backup_key
+            logger.info("No existing data, using only new data")
+            combined_table = new_table
+
+        # Back up the existing file while the new version is written and
+        # uploaded; the backup only has to finish before the standard path moves
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            backup_future = executor.submit(
+                backup_object, dst_bucket, current_key, f"{dst_prefix}data.backup.parquet"
             )
-        except s3.exceptions.ClientError as e:
-            if e.response['Error']['Code'] != '404':
-                raise
-            logger.info("No existing Parquet file to backup")
-
-        # Ensure date column is in datetime format with proper timezone handling
-        try:
-            if 'date' in combined_df.columns:
-                logger.info("Converting date column to datetime format with consistent timezone")
-                combined_df['date'] = pd.to_datetime(combined_df['date'], errors='coerce')
-
-                # Make sure all datetime fields have the same timezone handling (or no timezone)
-                combined_df['date'] = combined_df['date'].dt.tz_localize(None)
-
-            if 'timestamp' in combined_df.columns:
-                logger.info("Ensuring timestamp column has consistent timezone")
-                combined_df['timestamp'] = pd.to_datetime(combined_df['timestamp'], errors='coerce')
-                combined_df['timestamp'] = combined_df['timestamp'].dt.tz_localize(None)
 
-        except Exception as e:
-            logger.warning(f"Error standardizing timezone info: {str(e)}. Will try to proceed.")
+            # Write the combined table directly, without a pandas round-trip
+            logger.info("Writing combined data in Parquet format")
+            out_buffer = write_parquet(combined_table)
 
-        # Write the combined data with explicit timezone handling
-        out_buffer = io.BytesIO()
-        logger.info("Converting DataFrame to Parquet format")
+            # Upload combined Parquet file (versioned)
+            versioned_key = f"{versioned_prefix}data.parquet"
+            logger.info(f"Uploading combined Parquet file ({combined_table.num_rows} rows) to s3://{dst_bucket}/{versioned_key}")
+            _S3.upload_fileobj(out_buffer, dst_bucket, versioned_key, Config=TRANSFER_CONFIG)
 
-        try:
-            combined_df.to_parquet(
-                out_buffer,
-                index=False,
-                schema=schema
-            )
-        except Exception as e:
-            logger.error(f"Error in to_parquet conversion: {str(e)}")
-
-            # Try alternative approach without schema if needed
-            logger.info("Trying alternative Parquet conversion approach")
-            out_buffer = io.BytesIO()
-            combined_df.to_parquet(
-                out_buffer,
-                index=False,
-                engine='pyarrow'
-            )
+            backup_future.result()
 
-        out_buffer.seek(0)
-
-        # Upload combined Parquet file (versioned)
-        versioned_key = f"{versioned_prefix}data.parquet"
-        logger.info(f"Uploading combined Parquet file ({len(combined_df)} rows) to s3://{dst_bucket}/{versioned_key}")
-        s3.put_object(
+        # Also publish to the standard path for backward compatibility. A server-side
+        # copy avoids uploading the same bytes a second time.
+        logger.info(f"Also copying to standard path: s3://{dst_bucket}/{current_key}")
+        _S3.copy_object(
             Bucket=dst_bucket,
-            Key=versioned_key,
-            Body=out_buffer.getvalue()
-        )
-
-        # Also upload to the standard path for backward compatibility
-        logger.info(f"Also uploading to standard path: s3://{dst_bucket}/{current_key}")
-        s3.put_object(
-            Bucket=dst_bucket,
-            Key=current_key,
-            Body=out_buffer.getvalue()
+            CopySource={'Bucket': dst_bucket, 'Key': versioned_key},
+            Key=current_key
         )
 
         # Update the last processed timestamp
@@ -378,8 +762,8 @@ def convert_to_parquet(src_bucket, files, dst_bucket, dst_prefix, version: Optio
             "source": f"s3://{src_bucket}",
             "destination": f"s3://{dst_bucket}/{versioned_key}",
             "standardPath": f"s3://{dst_bucket}/{current_key}",
-            "new_rows_processed": len(new_df),
-            "total_rows": len(combined_df),
+            "new_rows_processed": new_table.num_rows,
+            "total_rows": combined_table.num_rows,
             "validation_errors": validation_errors if validation_errors else None,
             "version": version
         }
@@ -397,7 +781,6 @@ def list_json_files(bucket: str, prefix: str, only_recent: bool = True) -> List[
     If only_recent is True, only returns files modified since the last processing run
     """
     logger.info(f"Listing JSON files in s3://{bucket}/{prefix}")
-    s3 = boto3.client("s3")
     files = []
 
     # Get the timestamp of the last processing run
@@ -405,33 +788,40 @@ def list_json_files(bucket: str, prefix: str, only_recent: bool = True) -> List[
 
     if last_processed:
         logger.info(f"Filtering for files modified after {last_processed}")
+        # S3 reports LastModified in UTC; compare both sides timezone-naive
+        naive_last_processed = last_processed.replace(tzinfo=None)
 
+    # Keys are partitioned by game date, not by write time, so a re-scraped older day
+    # can change after newer keys. That rules out StartAfter; filter on LastModified.
+    seen = skipped_meta = skipped_old = 0
     try:
-        paginator = s3.get_paginator('list_objects_v2')
-        for page in paginator.paginate(Bucket=bucket, Prefix=prefix):
-            if 'Contents' in page:
-                for obj in page['Contents']:
-                    key = obj['Key']
-                    last_modified = obj['LastModified']
-
-                    # Skip files that haven't been modified since the last processing run
-                    if only_recent and last_processed:
-                        # Ensure both are timezone-naive for proper comparison
-                        naive_last_modified = last_modified.replace(tzinfo=None)
-                        naive_last_processed = last_processed.replace(tzinfo=None) if last_processed.tzinfo else last_processed
-                        if naive_last_modified <= naive_last_processed:
-                            continue
-
-                    # Filter out meta.json files
-                    if key.endswith('meta.json'):
-                        logger.info(f"Skipping metadata file: {key}")
-                        continue
+        paginator = _S3.get_paginator('list_objects_v2')
+        pages = paginator.paginate(Bucket=bucket, Prefix=prefix, FetchOwner=False, PaginationConfig={'PageSize': 1000})
+        for page in pages:
+            for obj in page.get('Contents', ()):
+                seen += 1
+                key = obj['Key']
 
-                    if key.endswith('.json') or key.endswith('.jsonl'):
-                        files.append(key)
-                        logger.info(f"Found file: {key}, Last Modified: {last_modified}")
+                # Cheap suffix check first, before looking at timestamps
+                if not key.endswith(JSON_SUFFIXES):
+                    continue
+
+                # Skip files that haven't been modified since the last processing run
+                if last_processed and obj['LastModified'].replace(tzinfo=None) <= naive_last_processed:
+                    skipped_old += 1
+                    continue
+
+                # Filter out meta.json files
+                if key.endswith('meta.json'):
+                    skipped_meta += 1
+                    continue
 
-        logger.info(f"Found {len(files)} JSON files to process")
+                files.append(key)
+
+        logger.info(
+            "list_json_files: seen=%d new=%d skipped_meta=%d skipped_old=%d",
+            seen, len(files), skipped_meta, skipped_old
+        )
         return files
 
     except Exception as e:
@@ -460,13 +850,11 @@ def build_dataset(src_bucket: str, src_prefix: str, dst_bucket: str, dst_prefix:
 
     logger.info(f'Using version identifier: {version}')
 
-    s3_client = boto3.client('s3')
-
     try:
         # List all Parquet files in the source prefix
         all_files = []
-        paginator = s3_client.get_paginator('list_objects_v2')
-        pages = paginator.paginate(Bucket=src_bucket, Prefix=src_prefix)
+        paginator = _S3.get_paginator('list_objects_v2')
+        pages = paginator.paginate(Bucket=src_bucket, Prefix=src_prefix, FetchOwner=False, PaginationConfig={'PageSize': 1000})
 
         for page in pages:
             if 'Contents' in page:
@@ -485,25 +873,26 @@ def build_dataset(src_bucket: str, src_prefix: str, dst_bucket: str, dst_prefix:
 
         logger.info(f'Found {len(all_files)} Parquet files to process')
 
-        # Load and combine all Parquet files
-        combined_df = None
+        # Stream the Parquet files in as they download, keeping only the projected
+        # columns of each, and combine them once at the end
+        tables = []
 
-        for file_key in all_files:
+        for file_key, data, error in iter_objects(src_bucket, all_files):
             logger.info(f'Processing file: {file_key}')
             try:
-                response = s3_client.get_object(Bucket=src_bucket, Key=file_key)
-                file_df = pd.read_parquet(io.BytesIO(response['Body'].read()))
+                if error:
+                    raise error
 
-                if combined_df is None:
-                    combined_df = file_df
-                else:
-                    combined_df = pd.concat([combined_df, file_df], ignore_index=True)
+                # Only the dataset columns (plus field, used for deduplication) are read
+                tables.append(normalize_timestamp_columns(
+                    read_parquet_columns(data, DATASET_SCHEMA.names + ['field'])
+                ))
             except Exception as e:
                 logger.error(f'Error processing file {file_key}: {str(e)}')
                 # Continue processing other files
                 continue
 
-        if combined_df is None or combined_df.empty:
+        if not tables or not any(table.num_rows for table in tables):
             logger.warning('No valid data found in any Parquet files')
             return {
                 'status': 'SUCCESS',
@@ -511,141 +900,38 @@ def build_dataset(src_bucket: str, src_prefix: str, dst_bucket: str, dst_prefix:
                 'filesProcessed': 0
             }
 
-        # Remove duplicates and sort
-        logger.info(f'Raw dataset size before deduplication: {len(combined_df)}')
+        # Concatenating Arrow tables just stitches chunks together
+        combined_table = pa.concat_tables(tables, promote_options='permissive')
+        del tables
 
-        # Use a combination of fields that should be unique for each game
-        combined_df.drop_duplicates(subset=['date', 'field', 'home_team', 'away_team', 'time'], inplace=True)
-
-        # Ensure datetime columns have consistent timezone handling
-        try:
-            logger.info("Standardizing datetime columns for consistent Parquet handling")
-
-            # Handle date column
-            if 'date' in combined_df.columns:
-                logger.info("Ensuring date column is properly formatted")
-                combined_df['date'] = pd.to_datetime(combined_df['date'], errors='coerce')
-                # Make timezone-naive for Parquet compatibility
-                if hasattr(combined_df['date'], 'dt'):
-                    combined_df['date'] = combined_df['date'].dt.tz_localize(None)
-
-            # Handle timestamp column
-            if 'timestamp' in combined_df.columns:
-                logger.info("Ensuring timestamp column is properly formatted")
-                combined_df['timestamp'] = pd.to_datetime(combined_df['timestamp'], errors='coerce')
-                # Make timezone-naive for Parquet compatibility
-                if hasattr(combined_df['timestamp'], 'dt'):
-                    combined_df['timestamp'] = combined_df['timestamp'].dt.tz_localize(None)
-
-            # Now sort by date and time
-            logger.info("Sorting by date and time")
-            combined_df.sort_values(by=['date', 'time'], inplace=True, na_position='last')
+        # Remove duplicates (keeping the newest copy of each game) and sort in Arrow
+        logger.info(f'Raw dataset size before deduplication: {combined_table.num_rows}')
+        combined_table = deduplicate_latest(
+            combined_table,
+            ['date', 'field', 'home_team', 'away_team', 'time']
+        )
+        sort_keys = [(name, 'ascending') for name in ('date', 'time') if name in combined_table.column_names]
+        if sort_keys:
+            combined_table = combined_table.sort_by(sort_keys)
 
-        except Exception as e:
-            logger.error(f"Error handling datetime columns: {str(e)}")
-            logger.info("Attempting alternative approach for timestamp handling")
+        logger.info(f'Final dataset size after deduplication: {combined_table.num_rows}')
 
-            try:
-                # If direct conversion fails, try an alternate approach
-                # First convert any problematic columns to string
-                if 'timestamp' in combined_df.columns:
-                    # Check the column type and try different approaches based on that
-                    col_type = combined_df['timestamp'].dtype
-                    logger.info(f"Timestamp column data type: {col_type}")
-
-                    if pd.api.types.is_datetime64_any_dtype(col_type):
-                        logger.info("Converting timestamp from datetime to string")
-                        combined_df['timestamp'] = combined_df['timestamp'].astype(str)
-                    else:
-                        logger.info("Attempting to parse timestamp strings")
-                        # Parse strings to datetime then back to strings to ensure consistency
-                        combined_df['timestamp'] = pd.to_datetime(combined_df['timestamp'], errors='coerce').astype(str)
-
-                # Also handle the date column if it exists
-                if 'date' in combined_df.columns:
-                    logger.info("Creating a datetime_sort column for sorting purposes")
-                    # Create a temporary column for sorting
-                    combined_df['datetime_sort'] = pd.to_datetime(combined_df['date'], errors='coerce')
-                    # Sort by the new column and time
-                    combined_df.sort_values(by=['datetime_sort', 'time'], inplace=True, na_position='last')
-                    # Drop the temporary sorting column
-                    combined_df.drop(columns=['datetime_sort'], inplace=True)
-
-                logger.info("Alternative timestamp handling approach applied")
-            except Exception as alt_err:
-                logger.error(f"Error in alternative timestamp handling approach: {str(alt_err)}")
-                logger.info("Proceeding with original data without timestamp modifications")
-
-        logger.info(f'Final dataset size after deduplication: {len(combined_df)}')
-
-        # Define schema with consistent timestamp handling
-        try:
-            logger.info("Setting up PyArrow schema for consistent Parquet conversion")
-            parquet_schema = pa.schema([
-                ('date', pa.timestamp('ns')),
-                ('home_team', pa.string()),
-                ('away_team', pa.string()),
-                ('home_score', pa.int64()),
-                ('away_score', pa.int64()),
-                ('league', pa.string()),
-                ('time', pa.string()),
-                ('url', pa.string()),
-                ('type', pa.string()),
-                ('status', pa.float64()),
-                ('headers', pa.string()),
-                ('timestamp', pa.string())  # Use string type for timestamp to avoid PyArrow issues
-            ])
-        except Exception as schema_err:
-            logger.error(f"Error creating schema: {str(schema_err)}")
-            logger.info("Will proceed without explicit schema")
-            parquet_schema = None
-
-        # Save as both Parquet and CSV
+        # Save as both Parquet and CSV straight from the Arrow table
         try:
             logger.info("Converting to Parquet format")
-            parquet_buffer = io.BytesIO()
-
-            if parquet_schema:
-                # Try with schema first
-                try:
-                    combined_df.to_parquet(parquet_buffer, schema=parquet_schema, index=False)
-                except Exception as e:
-                    logger.warning(f"Parquet conversion with schema failed: {str(e)}")
-                    logger.info("Trying without schema")
-                    parquet_buffer = io.BytesIO()
-                    combined_df.to_parquet(parquet_buffer, index=False)
-            else:
-                # No schema available
-                combined_df.to_parquet(parquet_buffer, index=False)
-
-            parquet_buffer.seek(0)
+            parquet_buffer = write_parquet(combined_table)
         except Exception as parquet_err:
             logger.error(f"Error in Parquet conversion: {str(parquet_err)}")
-            logger.info("Attempting simpler conversion approach")
-
-            try:
-                # If direct Parquet conversion fails, try JSON serialization as intermediate step
-                json_str = combined_df.to_json(orient='records', date_format='iso')
-                clean_df = pd.read_json(json_str, orient='records')
-
-                parquet_buffer = io.BytesIO()
-                clean_df.to_parquet(parquet_buffer, index=False)
-                parquet_buffer.seek(0)
-                logger.info("Successfully converted to Parquet using alternative approach")
-            except Exception as alt_parquet_err:
-                logger.error(f"Alternative Parquet conversion also failed: {str(alt_parquet_err)}")
-                return {
-                    'status': 'ERROR',
-                    'message': f'Failed to convert data to Parquet format: {str(alt_parquet_err)}',
-                    'filesProcessed': len(all_files)
-                }
+            return {
+                'status': 'ERROR',
+                'message': f'Failed to convert data to Parquet format: {str(parquet_err)}',
+                'filesProcessed': len(all_files)
+            }
 
         # Convert to CSV (generally more robust)
         try:
             logger.info("Converting to CSV format")
-            csv_buffer = io.StringIO()
-            combined_df.to_csv(csv_buffer, index=False)
-            csv_buffer.seek(0)
+            csv_buffer = write_csv(combined_table)
         except Exception as csv_err:
             logger.error(f"Error in CSV conversion: {str(csv_err)}")
             return {
@@ -662,31 +948,23 @@ def build_dataset(src_bucket: str, src_prefix: str, dst_bucket: str, dst_prefix:
         parquet_latest_key = f"{dst_prefix}ncsoccer_games_latest.parquet"
         csv_latest_key = f"{dst_prefix}ncsoccer_games_latest.csv"
 
-        # Upload versioned datasets
-        s3_client.put_object(
-            Body=parquet_buffer.getvalue(),
-            Bucket=dst_bucket,
-            Key=parquet_key
-        )
+        def publish(key: str, latest_key: str, body: io.BytesIO) -> None:
+            # Upload the versioned file, then publish 'latest' with a server-side copy
+            _S3.upload_fileobj(body, dst_bucket, key, Config=TRANSFER_CONFIG)
+            _S3.copy_object(
+                Bucket=dst_bucket,
+                CopySource={'Bucket': dst_bucket, 'Key': key},
+                Key=latest_key
+            )
 
-        s3_client.put_object(
-            Body=csv_buffer.getvalue(),
-            Bucket=dst_bucket,
-            Key=csv_key
-        )
-
-        # Upload 'latest' versions
-        s3_client.put_object(
-            Body=parquet_buffer.getvalue(),
-            Bucket=dst_bucket,
-            Key=parquet_latest_key
-        )
-
-        s3_client.put_object(
-            Body=csv_buffer.getvalue(),
-            Bucket=dst_bucket,
-            Key=csv_latest_key
-        )
+        # Publish the Parquet and CSV datasets in parallel
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            futures = [
+                executor.submit(publish, parquet_key, parquet_latest_key, parquet_buffer),
+                executor.submit(publish, csv_key, csv_latest_key, csv_buffer)
+            ]
+            for future in futures:
+                future.result()
 
         logger.info(f'Successfully built and uploaded final dataset:')
         logger.info(f' - Versioned files: {dst_bucket}/{parquet_key} and {dst_bucket}/{csv_key}')
@@ -696,7 +974,7 @@ def build_dataset(src_bucket: str, src_prefix: str, dst_bucket: str, dst_prefix:
             'status': 'SUCCESS',
             'message': 'Successfully built and uploaded final dataset',
             'filesProcessed': len(all_files),
-            'totalRecords': len(combined_df),
+            'totalRecords': combined_table.num_rows,
             'parquetPath': f"s3://{dst_bucket}/{parquet_key}",
             'csvPath': f"s3://{dst_bucket}/{csv_key}",
             'latestParquetPath': f"s3://{dst_bucket}/{parquet_latest_key}",
@@ -709,46 +987,54 @@ def build_dataset(src_bucket: str, src_prefix: str, dst_bucket: str, dst_prefix:
         logger.error(error_msg)
         raise Exception(error_msg)
 
-def check_backfill_status(src_bucket: str, src_prefix: str) -> Dict[str, Any]:
-    """Check the status of a backfill operation by examining markers in S3"""
-    logger.info(f'Checking backfill status in {src_bucket}/{src_prefix}')
+def _list_cached(bucket: str, prefix: str, ttl: float = LIST_CACHE_TTL) -> List[str]:
+    """List every key under a prefix, reusing a listing made within the last ttl seconds
 
-    s3_client = boto3.client('s3')
+    Set NCSH_DISABLE_LIST_CACHE=1 to always list afresh.
+    """
+    use_cache = os.environ.get('NCSH_DISABLE_LIST_CACHE') != '1'
+    if use_cache:
+        cached = _LIST_CACHE.get((bucket, prefix))
+        if cached and time.time() - cached[0] < ttl:
+            return cached[1]
 
-    try:
-        # Check for backfill marker files
-        backfill_in_progress = False
-        backfill_completed = False
+    keys = []
+    paginator = _S3.get_paginator('list_objects_v2')
+    for page in paginator.paginate(Bucket=bucket, Prefix=prefix, FetchOwner=False, PaginationConfig={'PageSize': 1000}):
+        keys.extend(obj['Key'] for obj in page.get('Contents', []))
 
-        # Check for in-progress marker
-        try:
-            s3_client.head_object(Bucket=src_bucket, Key=f"{src_prefix}backfill_in_progress.marker")
-            backfill_in_progress = True
-        except s3_client.exceptions.ClientError:
-            # Marker doesn't exist, which is fine
-            pass
+    if use_cache:
+        _LIST_CACHE[(bucket, prefix)] = (time.time(), keys)
+    return keys
 
-        # Check for completed marker
-        try:
-            s3_client.head_object(Bucket=src_bucket, Key=f"{src_prefix}backfill_completed.marker")
-            backfill_completed = True
-        except s3_client.exceptions.ClientError:
-            # Marker doesn't exist, which is fine
-            pass
-
-        # Count the number of files processed
-        file_count = 0
-        paginator = s3_client.get_paginator('list_objects_v2')
-        pages = paginator.paginate(Bucket=src_bucket, Prefix=src_prefix)
+def check_backfill_status(src_bucket: str, src_prefix: str, exact_count: bool = False) -> Dict[str, Any]:
+    """Check the status of a backfill operation by examining markers in S3
 
-        for page in pages:
-            if 'Contents' in page:
-                for obj in page['Contents']:
-                    key = obj['Key']
-                    if key.endswith('.json') or key.endswith('.jsonl'):
-                        file_count += 1
+    Args:
+        src_bucket: Source S3 bucket containing JSON files
+        src_prefix: Prefix for JSON files in the source bucket
+        exact_count: Count every JSON file under the prefix. By default the
+            listing stops at the first file and filesCount is '>=1' or 0.
+    """
+    logger.info(f'Checking backfill status in {src_bucket}/{src_prefix}')
 
-        logger.info(f'Found {file_count} JSON files in {src_bucket}/{src_prefix}')
+    try:
+        # Both marker files share the backfill_ prefix, so a single LIST
+        # answers both questions instead of one HEAD round-trip per marker
+        marker_keys = _list_cached(src_bucket, f"{src_prefix}backfill_")
+        backfill_in_progress = any(key.endswith('backfill_in_progress.marker') for key in marker_keys)
+        backfill_completed = any(key.endswith('backfill_completed.marker') for key in marker_keys)
+
+        if exact_count:
+            file_count = sum(1 for key in _list_cached(src_bucket, src_prefix) if key.endswith(JSON_SUFFIXES))
+            logger.info(f'Found {file_count} JSON files in {src_bucket}/{src_prefix}')
+        else:
+            # The status decision only needs to know whether any JSON file exists,
+            # so stop at the first one rather than listing the whole prefix
+            paginator = _S3.get_paginator('list_objects_v2')
+            pages = paginator.paginate(Bucket=src_bucket, Prefix=src_prefix, FetchOwner=False, PaginationConfig={'PageSize': 1000})
+            # search() yields matching keys page by page (None for empty pages)
+            file_count = int(any(pages.search(JSON_KEYS_QUERY)))
 
         # Determine the backfill status
         status = "UNKNOWN"
@@ -765,7 +1051,7 @@ def check_backfill_status(src_bucket: str, src_prefix: str) -> Dict[str, Any]:
 
         return {
             'status': status,
-            'filesCount': file_count,
+            'filesCount': file_count if exact_count or not file_count else '>=1',
             'inProgressMarker': backfill_in_progress,
             'completedMarker': backfill_completed
         }
@@ -865,7 +1151,6 @@ def process_all(src_bucket: str, src_prefix: str, dst_bucket: str, dst_prefix: s
         result = convert_to_parquet(src_bucket, files, dst_bucket, dst_prefix)
         
         # Store detailed results in S3 to avoid Step Functions payload size limitation
-        s3_client = boto3.client('s3')
         timestamp = datetime.now(timezone.utc).strftime('%Y-%m-%d-%H-%M-%S')
         
         # Ensure clean path construction without double slashes
@@ -886,10 +1171,10 @@ def process_all(src_bucket: str, src_prefix: str, dst_bucket: str, dst_prefix: s
         
         # Store detailed results in S3
         logger.info(f"Storing detailed processing results in S3: {dst_bucket}/{result_key}")
-        s3_client.put_object(
+        _S3.put_object(
             Bucket=dst_bucket,
             Key=result_key,
-            Body=json.dumps(detailed_results),
+            Body=orjson.dumps(detailed_results),
             ContentType='application/json'
         )
 
@@ -910,7 +1195,9 @@ def process_all(src_bucket: str, src_prefix: str, dst_bucket: str, dst_prefix: s
 
 def lambda_handler(event, context):
     """AWS Lambda handler for the processing pipeline"""
-    logger.info(f"Processing event: {json.dumps(event)}")
+    # Convert events can carry thousands of file keys, so only format them when logged
+    if logger.isEnabledFor(logging.INFO):
+        logger.info("Processing event: %s", json.dumps(event))
 
     try:
         # Get operation type
@@ -973,7 +1260,7 @@ def lambda_handler(event, context):
 
         elif operation == "check_backfill_status":
             # Check status of backfill operation
-            return check_backfill_status(src_bucket, src_prefix)
+            return check_backfill_status(src_bucket, src_prefix, event.get('exact_count', False))
 
         elif operation == "process_all":
             # Process all files regardless of last modified time
@@ -1,6 +1,14 @@
+import re
 from datetime import datetime, timezone
-from typing import Optional
-from pydantic import BaseModel, Field, validator
+from typing import Any, Dict, List, Optional
+from pydantic import BaseModel, Field, field_validator
+
+# Fallback date format used by some schedule pages, e.g. "Sat-Jun 1"
+_DATE_RE = re.compile(r'(?:\w+)-(\w+) (\d+)')
+_MONTHS = {
+    'Jan': 1, 'Feb': 2, 'Mar': 3, 'Apr': 4, 'May': 5, 'Jun': 6,
+    'Jul': 7, 'Aug': 8, 'Sep': 9, 'Oct': 10, 'Nov': 11, 'Dec': 12
+}
 
 class Game(BaseModel):
     """Schema for a single game with strict validation"""
@@ -11,15 +19,17 @@ class Game(BaseModel):
     league: str = Field(..., min_length=1)
     time: Optional[str] = None
 
-    @validator('home_team', 'away_team', 'league')
-    def validate_strings(cls, v):
+    @field_validator('home_team', 'away_team', 'league')
+    @classmethod
+    def validate_strings(cls, v: str) -> str:
         """Ensure strings are properly formatted"""
         if not v or not v.strip():
             raise ValueError("Field cannot be empty or whitespace")
         return v.strip()
 
-    @validator('home_score', 'away_score')
-    def validate_scores(cls, v):
+    @field_validator('home_score', 'away_score')
+    @classmethod
+    def validate_scores(cls, v: Optional[int]) -> Optional[int]:
         """Ensure scores are valid when present"""
         if v is not None and v < 0:
             raise ValueError("Score cannot be negative")
@@ -35,8 +45,9 @@ class GameData(BaseModel):
     headers: Optional[str] = None
     timestamp: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
 
-    @validator('url')
-    def validate_url(cls, v):
+    @field_validator('url')
+    @classmethod
+    def validate_url(cls, v: Optional[str]) -> Optional[str]:
         """Ensure URL is properly formatted when present"""
         if v is not None:
             if not v.strip():
@@ -45,7 +56,8 @@ class GameData(BaseModel):
                 raise ValueError("URL must start with http:// or https://")
         return v
 
-    @validator('date', pre=True)
+    @field_validator('date', mode='before')
+    @classmethod
     def validate_date(cls, v):
         """Convert string dates to datetime objects"""
         if isinstance(v, str):
@@ -59,21 +71,13 @@ class GameData(BaseModel):
             except ValueError:
                 try:
                     # Try other formats (e.g., "Sat-Jun 1")
-                    import re
-                    import datetime as dt
-
-                    # Handle format like "Sat-Jun 1"
-                    match = re.match(r'(?:\w+)-(\w+) (\d+)', v)
+                    match = _DATE_RE.match(v)
                     if match:
                         month_str, day_str = match.groups()
-                        month_map = {
-                            'Jan': 1, 'Feb': 2, 'Mar': 3, 'Apr': 4, 'May': 5, 'Jun': 6,
-                            'Jul': 7, 'Aug': 8, 'Sep': 9, 'Oct': 10, 'Nov': 11, 'Dec': 12
-                        }
-                        month = month_map.get(month_str, 1)  # Default to January if not recognized
+                        month = _MONTHS.get(month_str, 1)  # Default to January if not recognized
                         day = int(day_str)
                         # Since we don't have year in this format, use current year
-                        current_year = dt.datetime.now().year
+                        current_year = datetime.now().year
                         return datetime(current_year, month, day)
 
                     # If all parsing attempts fail, raise error
@@ -85,7 +89,8 @@ class GameData(BaseModel):
             return v.replace(tzinfo=None)
         return v
 
-    @validator('timestamp', pre=True)
+    @field_validator('timestamp', mode='before')
+    @classmethod
     def validate_timestamp(cls, v):
         """Ensure timestamp is properly formatted and timezone-aware"""
         if isinstance(v, str):
@@ -119,4 +124,26 @@ class GameData(BaseModel):
             if base_dict['timestamp'].tzinfo is not None:
                 base_dict['timestamp'] = base_dict['timestamp'].replace(tzinfo=None)
 
-        return {**base_dict, **game_dict}
\ No newline at end of file
+        return {**base_dict, **game_dict}
+
+    def to_columns(self, columns: Dict[str, List[Any]]) -> None:
+        """Append this record's flat fields to per-column lists (e.g. for pa.Table.from_pydict)
+
+        Produces the same values as to_dict without building intermediate dicts.
+        """
+        game = self.games
+        date = self.date.replace(tzinfo=None) if self.date.tzinfo is not None else self.date
+        timestamp = self.timestamp.replace(tzinfo=None) if self.timestamp.tzinfo is not None else self.timestamp
+
+        columns['date'].append(date)
+        columns['home_team'].append(game.home_team)
+        columns['away_team'].append(game.away_team)
+        columns['home_score'].append(game.home_score)
+        columns['away_score'].append(game.away_score)
+        columns['league'].append(game.league)
+        columns['time'].append(game.time)
+        columns['url'].append(self.url)
+        columns['type'].append(self.type)
+        columns['status'].append(self.status)
+        columns['headers'].append(self.headers)
+        columns['timestamp'].append(timestamp)
@@ -11,6 +11,7 @@ import sys
 import json
 import logging
 import argparse
+import calendar
 from datetime import datetime
 import time
 
@@ -29,13 +30,16 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# Past months' schedule pages are cached here, so a resumed backfill doesn't fetch them again
+HTTP_CACHE_DIR = "/tmp/http_cache" if os.environ.get('AWS_LAMBDA_FUNCTION_NAME') else "data/http_cache"
+
 def run_backfill(start_year=2007, start_month=1, end_year=None, end_month=None,
                  storage_type='s3', bucket_name=None, html_prefix='data/html',
                  json_prefix='data/json', lookup_file='data/lookup.json',
                  lookup_type='file', region='us-east-2', table_name=None,
-                 force_scrape=False, timeout=900):
+                 force_scrape=False, timeout=900, max_months=4, http_cache_dir=HTTP_CACHE_DIR):
     """
-    Run the backfill process to scrape historical data using SimpleScraper.
+    Run the backfill process to scrape historical data, a few months at a time.
 
     Args:
         start_year (int): The starting year for backfill (earliest)
@@ -51,6 +55,9 @@ def run_backfill(start_year=2007, start_month=1, end_year=None, end_month=None,
         region (str): AWS region for S3 and DynamoDB
         force_scrape (bool): Whether to force re-scrape of days
         timeout (int): Maximum execution time in seconds
+        max_months (int): Number of months scraped concurrently
+        http_cache_dir (str): Directory to cache past months' schedule pages in,
+            or None to always fetch them
 
     Returns:
         dict: Results of the backfill operation
@@ -58,8 +65,8 @@ def run_backfill(start_year=2007, start_month=1, end_year=None, end_month=None,
     logger.info(f"Starting backfill from {start_year}-{start_month} "
                 f"to {end_year or 'current year'}-{end_month or 'current month'}")
 
-    # Import the scraper implementation
-    from ncsoccer.scraper import SimpleScraper
+    # Import the runner implementation
+    from ncsoccer.runner import run_date_range
 
     # Set end date to current date if not specified
     if not end_year or not end_month:
@@ -67,38 +74,15 @@ def run_backfill(start_year=2007, start_month=1, end_year=None, end_month=None,
         end_year = end_year or now.year
         end_month = end_month or now.month
 
-    # Configure storage settings
-    storage_config = {
-        'storage_type': storage_type,
-        'bucket_name': bucket_name,
-        'html_prefix': html_prefix,
-        'json_prefix': json_prefix,
-        'lookup_file': lookup_file,
-        'lookup_type': lookup_type,
-        'region': region,
-        'table_name': table_name
-    }
-
-    # Create start time and timeout tracker
+    # Create start time for the elapsed time report
     start_time = time.time()
 
-    def check_timeout():
-        """Check if we've exceeded the timeout limit"""
-        elapsed = time.time() - start_time
-        if elapsed > timeout:
-            logger.warning(f"Timeout reached after {elapsed:.1f} seconds")
-            return True
-        return False
-
-    # Configure and run the scraper
+    # Scrape the months concurrently, newest first, and stop waiting at the timeout;
+    # months still unfinished are reported so the caller can resume them
     try:
-        scraper = SimpleScraper(
-            mode='backfill',
-            start_year=start_year,
-            start_month=start_month,
-            end_year=end_year,
-            end_month=end_month,
-            force_scrape=force_scrape,
+        result = run_date_range(
+            f"{start_year}-{start_month:02d}-01",
+            f"{end_year}-{end_month:02d}-{calendar.monthrange(end_year, end_month)[1]:02d}",
             storage_type=storage_type,
             bucket_name=bucket_name,
             html_prefix=html_prefix,
@@ -106,11 +90,15 @@ def run_backfill(start_year=2007, start_month=1, end_year=None, end_month=None,
             lookup_file=lookup_file,
             lookup_type=lookup_type,
             region=region,
-            table_name=table_name
+            force_scrape=force_scrape,
+            max_months=max_months,
+            timeout=timeout,
+            newest_first=True,
+            http_cache_dir=http_cache_dir
         )
 
-        # Run the scraper with timeout checking
-        result = scraper.run(timeout_callback=check_timeout)
+        if 'error' in result:
+            raise Exception(result['error'])
 
         # Log completion and return results
         elapsed = time.time() - start_time
@@ -118,9 +106,11 @@ def run_backfill(start_year=2007, start_month=1, end_year=None, end_month=None,
         logger.info(f"Processed months from {start_year}-{start_month} to {end_year}-{end_month}")
 
         return {
-            'success': True,
-            'processed_months': result.get('processed_months', 0),
-            'processed_days': result.get('processed_days', 0),
+            'success': result['success'],
+            'processed_months': result.get('months_processed', 0),
+            'processed_days': result.get('days_processed', 0),
+            'failed_dates': result.get('failed_dates', []),
+            'remaining_months': result.get('remaining_months', []),
             'elapsed_seconds': elapsed,
             'start_year': start_year,
             'start_month': start_month,
@@ -150,7 +140,9 @@ def lambda_handler(event, context):
     Returns:
         dict: Results of the backfill operation
     """
-    logger.info(f"Received event: {json.dumps(event)}")
+    # Only serialize the event when the record will actually be emitted
+    if logger.isEnabledFor(logging.INFO):
+        logger.info("Received event: %s", json.dumps(event))
 
     # Extract parameters from event
     params = {}
@@ -167,6 +159,7 @@ def lambda_handler(event, context):
     params['region'] = event.get('region', 'us-east-2')
     params['table_name'] = event.get('table_name')
     params['force_scrape'] = event.get('force_scrape', False)
+    params['http_cache_dir'] = event.get('http_cache_dir', HTTP_CACHE_DIR)
 
     # Calculate timeout, leaving buffer for lambda shutdown
     max_duration = context.get_remaining_time_in_millis() / 1000 if context else 900
@@ -191,6 +184,8 @@ if __name__ == "__main__":
     parser.add_argument('--table-name', help='DynamoDB table name')
     parser.add_argument('--force-scrape', action='store_true', help='Force re-scrape')
     parser.add_argument('--timeout', type=int, default=900, help='Maximum execution time in seconds')
+    parser.add_argument('--max-months', type=int, default=4, help='Months scraped concurrently')
+    parser.add_argument('--http-cache-dir', default=HTTP_CACHE_DIR, help="Directory to cache past months' schedule pages in")
 
     args = parser.parse_args()
     result = run_backfill(**vars(args))
@@ -1,12 +1,16 @@
 import os
-import sys
 import json
 import time
+import uuid
 import logging
-import calendar
 from datetime import datetime, date, timedelta
-from dateutil.relativedelta import relativedelta
-from ncsoccer.scraper import SimpleScraper, scrape_single_date, scrape_date_range
+import boto3
+import requests
+from requests.adapters import HTTPAdapter
+import orjson
+from botocore.config import Config
+from ncsoccer.scraper import SimpleScraper
+from ncsoccer.runner import _last_day, _months_between
 from ncsoccer.pipeline.config import DataArchitectureVersion
 
 logger = logging.getLogger()
@@ -16,6 +20,88 @@ logging.getLogger("botocore").setLevel(logging.WARNING)
 logging.getLogger("urllib3").setLevel(logging.WARNING)
 logging.getLogger("boto3").setLevel(logging.WARNING)
 
+# Defaults read once per container; the environment doesn't change between warm invocations
+DATA_BUCKET = os.environ.get('DATA_BUCKET', 'ncsh-app-data')
+DEFAULT_REGION = 'us-east-2'
+# Only the v2 (partitioned) architecture is supported
+ARCHITECTURE_VERSION = DataArchitectureVersion.V2
+
+# S3 clients are created once per region and reused by every warm invocation. Short
+# timeouts and a capped retry budget keep a stalled request from eating the
+# invocation's ~30 second window
+S3_CONFIG = Config(
+    max_pool_connections=50,
+    tcp_keepalive=True,
+    connect_timeout=3,
+    read_timeout=10,
+    retries={'total_max_attempts': 3, 'mode': 'adaptive'}
+)
+_S3_CLIENTS = {}
+
+
+def get_s3_client(region=DEFAULT_REGION):
+    """Get the shared S3 client for a region, creating it on first use"""
+    if region not in _S3_CLIENTS:
+        _S3_CLIENTS[region] = boto3.client('s3', region_name=region, config=S3_CONFIG)
+    return _S3_CLIENTS[region]
+
+
+# Build the default client during cold start rather than in the first request
+get_s3_client(DEFAULT_REGION)
+
+# Upper bound on dates scraped at once by the unified handler
+SCRAPE_CONCURRENCY = int(os.environ.get('SCRAPE_CONCURRENCY', '8'))
+# When set, multi-day unified requests are split into one asynchronous invocation
+# of this function per day instead of being scraped in a single invocation
+SCRAPE_FANOUT = os.environ.get('SCRAPE_FANOUT', '').lower() == 'true'
+_LAMBDA_CLIENT = None
+
+
+def get_lambda_client():
+    """Get the shared Lambda client used for per-day fan-out, creating it on first use"""
+    global _LAMBDA_CLIENT
+    if _LAMBDA_CLIENT is None:
+        _LAMBDA_CLIENT = boto3.client('lambda', region_name=DEFAULT_REGION)
+    return _LAMBDA_CLIENT
+
+# One pooled HTTP session per container, so warm invocations reuse TLS connections
+# to the schedule site instead of handshaking again. The scraper retries itself, so
+# the adapter doesn't
+HTTP_SESSION = requests.Session()
+HTTP_SESSION.mount('https://', HTTPAdapter(pool_connections=10, pool_maxsize=20))
+
+def _ints(values, keys):
+    """Coerce the given keys of an event dict to int, skipping missing or null values"""
+    return {key: int(values[key]) for key in keys if values.get(key) is not None}
+
+def _parse_ymd(value):
+    """Parse a YYYY-MM-DD string into a date, slicing the fixed format instead of using strptime"""
+    if len(value) == 10 and value[4] == '-' and value[7] == '-':
+        try:
+            return date(int(value[:4]), int(value[5:7]), int(value[8:10]))
+        except ValueError:
+            pass
+    # Let strptime handle anything unusual and produce the error message
+    return datetime.strptime(value, '%Y-%m-%d').date()
+
+def _dumps(obj):
+    """Serialize to a JSON string with orjson, which is several times faster than json"""
+    return orjson.dumps(obj).decode()
+
+def _response(status_code, body):
+    """Wrap a result dict in the statusCode/body envelope returned by every handler"""
+    return {
+        'statusCode': status_code,
+        'body': _dumps(body)
+    }
+
+def _error_response(status_code, error):
+    """Build a failed response carrying just the error message"""
+    return _response(status_code, {
+        'success': False,
+        'error': error
+    })
+
 def lambda_handler(event, context):
     """
     AWS Lambda handler function for date range scraping
@@ -33,6 +119,7 @@ def lambda_handler(event, context):
                     "architecture_version": "v1",
                     "start_date": "2024-01-01",  # For date_range mode
                     "end_date": "2024-01-31",    # For date_range mode
+                    "distributed": true,         # date_range: only plan per-month batches
                     ...
                 }
 
@@ -44,6 +131,12 @@ def lambda_handler(event, context):
                 "force_scrape": true,
                 "architecture_version": "v1",
                 "bucket_name": "ncsh-app-data"
+
+                # OR
+
+                # Warmup ping, e.g. from an EventBridge rule on cron(0/10 * * * ? *);
+                # returns right away once module init has run
+                "warmup": true
             }
         context (LambdaContext): Lambda context
 
@@ -51,7 +144,13 @@ def lambda_handler(event, context):
         dict: Result of the scraping operation
     """
     try:
-        logger.info(f"Received event: {json.dumps(event)}")
+        # Keep-warm pings only need the module-level setup above to have run
+        if isinstance(event, dict) and event.get('warmup'):
+            return _response(200, {'pong': True})
+
+        # Only serialize the event when the record will actually be emitted
+        if logger.isEnabledFor(logging.INFO):
+            logger.info("Received event: %s", _dumps(event))
 
         # Detect if the event is using the new unified format or legacy format
         if "start_date" in event and "end_date" in event:
@@ -64,23 +163,73 @@ def lambda_handler(event, context):
         else:
             error_msg = "Invalid event format. Must include either 'mode' parameter (legacy) or 'start_date'/'end_date' parameters (unified)."
             logger.error(error_msg)
-            return {
-                'statusCode': 400,
-                'body': json.dumps({
-                    'success': False,
-                    'error': error_msg
-                })
-            }
+            return _error_response(400, error_msg)
 
     except Exception as e:
         logger.error(f"Error in lambda_handler: {str(e)}", exc_info=True)
-        return {
-            'statusCode': 500,
-            'body': json.dumps({
-                'success': False,
-                'error': str(e)
-            })
-        }
+        return _error_response(500, str(e))
+
+def lambda_handler_single_day(event, context):
+    """
+    AWS Lambda handler for scraping a single day, e.g. from an EventBridge rule or
+    the per-day fan-out
+
+    Args:
+        event (dict): {"date": "2024-01-01", ...} plus any unified-format options
+        context (LambdaContext): Lambda context
+
+    Returns:
+        dict: Result of the scraping operation
+    """
+    date_str = event.get('date')
+    if not date_str:
+        error_msg = "Missing required parameter: date"
+        logger.error(error_msg)
+        return _error_response(400, error_msg)
+    return handle_unified_format({**event, 'start_date': date_str, 'end_date': date_str}, context)
+
+def fan_out_days(event, context, start_date, end_date):
+    """
+    Invoke this function asynchronously once per day of the range, so the days are
+    scraped by parallel Lambda instances
+
+    Args:
+        event (dict): Unified format event to copy the options from
+        context (LambdaContext): Lambda context, whose function ARN is invoked
+        start_date (date): First day of the range
+        end_date (date): Last day of the range
+
+    Returns:
+        dict: Response listing the dates submitted and the dates that failed to submit
+    """
+    lambda_client = get_lambda_client()
+    dates_submitted = []
+    failed_dates = []
+    for offset in range((end_date - start_date).days + 1):
+        date_str = (start_date + timedelta(days=offset)).isoformat()
+        # Earlier days are already running, so keep going and report the failures
+        # rather than aborting the whole fan-out
+        try:
+            lambda_client.invoke(
+                FunctionName=context.invoked_function_arn,
+                InvocationType='Event',
+                Payload=_dumps({**event, 'start_date': date_str, 'end_date': date_str})
+            )
+        except Exception as e:
+            logger.error(f"Failed to submit invocation for {date_str}: {str(e)}")
+            failed_dates.append(date_str)
+            continue
+        dates_submitted.append(date_str)
+
+    logger.info("Submitted %d single-day invocations, %d failed", len(dates_submitted), len(failed_dates))
+    return _response(200, {
+        'success': not failed_dates,
+        'fan_out': True,
+        'start_date': start_date.isoformat(),
+        'end_date': end_date.isoformat(),
+        'dates_submitted': dates_submitted,
+        'failed_dates': failed_dates
+    })
 
 def handle_unified_format(event, context):
     """
@@ -102,35 +251,25 @@ def handle_unified_format(event, context):
         if not start_date_str or not end_date_str:
             error_msg = "Missing required parameters: start_date and end_date"
             logger.error(error_msg)
-            return {
-                'statusCode': 400,
-                'body': json.dumps({
-                    'success': False,
-                    'error': error_msg
-                })
-            }
+            return _error_response(400, error_msg)
 
         # Parse dates
         try:
-            # Use the imported datetime module explicitly to avoid local variable shadowing
-            from datetime import datetime as dt
-            start_date = dt.strptime(start_date_str, '%Y-%m-%d').date()
-            end_date = dt.strptime(end_date_str, '%Y-%m-%d').date()
+            start_date = _parse_ymd(start_date_str)
+            end_date = _parse_ymd(end_date_str)
         except ValueError as e:
             error_msg = f"Invalid date format: {str(e)}. Use YYYY-MM-DD format."
             logger.error(error_msg)
-            return {
-                'statusCode': 400,
-                'body': json.dumps({
-                    'success': False,
-                    'error': error_msg
-                })
-            }
+            return _error_response(400, error_msg)
+
+        # Each fanned-out invocation covers a single day, so this doesn't recurse
+        if SCRAPE_FANOUT and context is not None and end_date > start_date:
+            return fan_out_days(event, context, start_date, end_date)
 
         # Extract parameters
         force_scrape = event.get('force_scrape', False)
-        architecture_version = "v2"  # Only support v2 architecture now
-        bucket_name = event.get('bucket_name', 'ncsh-app-data')
+        architecture_version = ARCHITECTURE_VERSION.value
+        bucket_name = event.get('bucket_name', DATA_BUCKET)
         scrape_only = event.get('scrape_only', False)  # New parameter for two-phase approach
         
         # CRITICAL: Ensure we're using clean paths without /tmp for v2 architecture
@@ -138,29 +277,29 @@ def handle_unified_format(event, context):
         html_prefix = event.get('html_prefix', 'v2/raw/html')
         if html_prefix.startswith('/tmp/'):
             html_prefix = html_prefix.replace('/tmp/', '')
-            logger.warning(f"Removed /tmp prefix from html_prefix: {html_prefix}")
+            logger.warning("Removed /tmp prefix from html_prefix: %s", html_prefix)
             
         json_prefix = event.get('json_prefix', 'v2/processed/json')
         if json_prefix.startswith('/tmp/'):
             json_prefix = json_prefix.replace('/tmp/', '')
-            logger.warning(f"Removed /tmp prefix from json_prefix: {json_prefix}")
+            logger.warning("Removed /tmp prefix from json_prefix: %s", json_prefix)
             
         lookup_file = event.get('lookup_file', 'v2/metadata/lookup.json')
         if lookup_file.startswith('/tmp/'):
             lookup_file = lookup_file.replace('/tmp/', '')
-            logger.warning(f"Removed /tmp prefix from lookup_file: {lookup_file}")
+            logger.warning("Removed /tmp prefix from lookup_file: %s", lookup_file)
             
-        region = event.get('region', 'us-east-2')
+        region = event.get('region', DEFAULT_REGION)
         timeout = event.get('timeout', 10)  # 10 seconds default timeout
         max_retries = event.get('max_retries', 3)
-        max_workers = event.get('max_workers', 2)  # Limit concurrency in Lambda
+        # Scraping is network bound, so overlap the dates up to SCRAPE_CONCURRENCY at a time
+        total_dates = (end_date - start_date).days + 1
+        max_workers = event.get('max_workers') or max(1, min(total_dates, SCRAPE_CONCURRENCY))
 
         # Always use S3 in Lambda
         storage_type = 's3'
 
-        # Architecture version is always v2
-        arch_version = DataArchitectureVersion("v2")
-        logger.info(f"Using architecture version: {arch_version.value}")
+        logger.info("Using architecture version: %s", architecture_version)
 
         # Record start time for timeout tracking
         start_time = time.time()
@@ -186,14 +325,16 @@ def handle_unified_format(event, context):
             architecture_version=architecture_version,
             max_workers=max_workers,
             timeout=timeout,
-            max_retries=max_retries
+            max_retries=max_retries,
+            session=HTTP_SESSION,
+            s3_client=get_s3_client(region)
         )
 
-        # Process date range
-        results = scraper.scrape_date_range(start_date, end_date)
+        # Process date range, returning what finished before the runtime budget runs out
+        results = scraper.scrape_date_range(start_date, end_date,
+                                            timeout=max(1, max_runtime - (time.time() - start_time)))
 
         # Calculate statistics
-        total_dates = (end_date - start_date).days + 1
         success_count = sum(1 for success in results.values() if success)
         failed_dates = [date for date, success in results.items() if not success]
         all_succeeded = success_count == total_dates
@@ -218,11 +359,7 @@ def handle_unified_format(event, context):
         }
         
         # Store detailed results in S3
-        import boto3
-        import uuid
-        from datetime import datetime
-        
-        s3 = boto3.client('s3')
+        s3 = get_s3_client(region)
         timestamp = datetime.now().strftime('%Y-%m-%d-%H-%M-%S')
         batch_id = str(uuid.uuid4())[:8]  # Use a short UUID for the batch ID
         results_key = f"{architecture_version}/metadata/batch_results/{start_date_str}_to_{end_date_str}_{timestamp}_{batch_id}.json"
@@ -231,10 +368,10 @@ def handle_unified_format(event, context):
             s3.put_object(
                 Bucket=bucket_name,
                 Key=results_key,
-                Body=json.dumps(detailed_results),
+                Body=orjson.dumps(detailed_results),
                 ContentType='application/json'
             )
-            logger.info(f"Stored detailed batch results in S3: s3://{bucket_name}/{results_key}")
+            logger.info("Stored detailed batch results in S3: s3://%s/%s", bucket_name, results_key)
             
             # Return minimal result with reference to S3
             result = {
@@ -259,22 +396,14 @@ def handle_unified_format(event, context):
                 'error_storing_results': str(e)
             }
 
-        logger.info(f"Scraping complete: {success_count}/{total_dates} dates succeeded in {time.time() - start_time:.2f} seconds")
+        logger.info("Scraping complete: %d/%d dates succeeded in %.2f seconds",
+                    success_count, total_dates, time.time() - start_time)
 
-        return {
-            'statusCode': 200,
-            'body': json.dumps(result)
-        }
+        return _response(200, result)
 
     except Exception as e:
         logger.error(f"Error in handle_unified_format: {str(e)}", exc_info=True)
-        return {
-            'statusCode': 500,
-            'body': json.dumps({
-                'success': False,
-                'error': str(e)
-            })
-        }
+        return _error_response(500, str(e))
 
 def handle_legacy_format(event, context):
     """
@@ -294,16 +423,20 @@ def handle_legacy_format(event, context):
 
         # Get common parameters with defaults
         force_scrape = parameters.get('force_scrape', False)
-        architecture_version = "v2"  # Only v2 is supported now
-        bucket_name = parameters.get('bucket_name', 'ncsh-app-data')
+        architecture_version = ARCHITECTURE_VERSION.value
+        bucket_name = parameters.get('bucket_name', DATA_BUCKET)
         html_prefix = parameters.get('html_prefix', 'v2/raw/html')
         json_prefix = parameters.get('json_prefix', 'v2/processed/json')
         lookup_file = parameters.get('lookup_file', 'v2/metadata/lookup.json')
-        region = parameters.get('region', 'us-east-2')
+        region = parameters.get('region', DEFAULT_REGION)
         timeout = parameters.get('timeout', 10)
         max_retries = parameters.get('max_retries', 3)
         max_workers = parameters.get('max_workers', 2)
 
+        # Date parts may arrive as strings ("01") or ints; missing ones default to today
+        date_parts = _ints(parameters, ('year', 'month', 'day'))
+        now = datetime.now()
+
         # Always use S3 in Lambda
         storage_type = 's3'
 
@@ -320,7 +453,9 @@ def handle_legacy_format(event, context):
             'architecture_version': architecture_version,
             'timeout': timeout,
             'max_retries': max_retries,
-            'max_workers': max_workers
+            'max_workers': max_workers,
+            'session': HTTP_SESSION,
+            's3_client': get_s3_client(region)
         }
 
         start_time = time.time()
@@ -328,9 +463,9 @@ def handle_legacy_format(event, context):
 
         if mode == 'day':
             # Single day mode
-            year = int(parameters.get('year', datetime.now().year))
-            month = int(parameters.get('month', datetime.now().month))
-            day = int(parameters.get('day', datetime.now().day))
+            year = date_parts.get('year', now.year)
+            month = date_parts.get('month', now.month)
+            day = date_parts.get('day', now.day)
 
             # Create scraper for single day
             scraper = SimpleScraper(
@@ -356,15 +491,12 @@ def handle_legacy_format(event, context):
 
         elif mode == 'month':
             # Month mode
-            year = int(parameters.get('year', datetime.now().year))
-            month = int(parameters.get('month', datetime.now().month))
+            year = date_parts.get('year', now.year)
+            month = date_parts.get('month', now.month)
 
             # Determine first and last day of month
             first_day = 1
-            if month == 12:
-                last_day = 31
-            else:
-                last_day = (datetime(year, month + 1, 1) - timedelta(days=1)).day
+            last_day = _last_day(year, month)
 
             # Create date objects
             start_date = datetime(year, month, first_day).date()
@@ -411,71 +543,74 @@ def handle_legacy_format(event, context):
             if not start_date_str or not end_date_str:
                 error_msg = "Missing required parameters: start_date and end_date"
                 logger.error(error_msg)
-                return {
-                    'statusCode': 400,
-                    'body': json.dumps({
-                        'success': False,
-                        'error': error_msg
-                    })
-                }
+                return _error_response(400, error_msg)
 
             try:
-                start_date = datetime.strptime(start_date_str, '%Y-%m-%d').date()
-                end_date = datetime.strptime(end_date_str, '%Y-%m-%d').date()
+                start_date = _parse_ymd(start_date_str)
+                end_date = _parse_ymd(end_date_str)
             except ValueError as e:
                 error_msg = f"Invalid date format: {str(e)}. Use YYYY-MM-DD format."
                 logger.error(error_msg)
-                return {
-                    'statusCode': 400,
-                    'body': json.dumps({
-                        'success': False,
-                        'error': error_msg
-                    })
+                return _error_response(400, error_msg)
+
+            if parameters.get('distributed'):
+                # Plan one unified-format batch per month instead of scraping here, so a
+                # Step Functions Map state can fan the months out to parallel invocations
+                batches = [
+                    {
+                        'start_date': f"{year}-{month:02d}-{first_day:02d}",
+                        'end_date': f"{year}-{month:02d}-{last_day:02d}",
+                        'days': last_day - first_day + 1
+                    }
+                    for year, month, first_day, last_day in _months_between(start_date, end_date)
+                ]
+                result = {
+                    'success': True,
+                    'mode': 'date_range',
+                    'distributed': True,
+                    'start_date': start_date_str,
+                    'end_date': end_date_str,
+                    'batch_count': len(batches),
+                    'batches': batches
+                }
+            else:
+                # Create scraper for date range
+                scraper = SimpleScraper(
+                    mode='range',
+                    start_year=start_date.year,
+                    start_month=start_date.month,
+                    start_day=start_date.day,
+                    end_year=end_date.year,
+                    end_month=end_date.month,
+                    end_day=end_date.day,
+                    **common_params
+                )
+
+                # Run scraper
+                results = scraper.scrape_date_range(start_date, end_date)
+
+                # Calculate statistics
+                total_dates = (end_date - start_date).days + 1
+                success_count = sum(1 for success in results.values() if success)
+                failed_dates = [date for date, success in results.items() if not success]
+                all_succeeded = success_count == total_dates
+
+                result = {
+                    'success': all_succeeded,
+                    'mode': 'date_range',
+                    'start_date': start_date_str,
+                    'end_date': end_date_str,
+                    'total_dates': total_dates,
+                    'success_count': success_count,
+                    'failed_dates': failed_dates,
+                    'games_scraped': scraper.games_scraped,
+                    'execution_time_seconds': time.time() - start_time
                 }
-
-            # Create scraper for date range
-            scraper = SimpleScraper(
-                mode='range',
-                start_year=start_date.year,
-                start_month=start_date.month,
-                start_day=start_date.day,
-                end_year=end_date.year,
-                end_month=end_date.month,
-                end_day=end_date.day,
-                **common_params
-            )
-
-            # Run scraper
-            results = scraper.scrape_date_range(start_date, end_date)
-
-            # Calculate statistics
-            total_dates = (end_date - start_date).days + 1
-            success_count = sum(1 for success in results.values() if success)
-            failed_dates = [date for date, success in results.items() if not success]
-            all_succeeded = success_count == total_dates
-
-            result = {
-                'success': all_succeeded,
-                'mode': 'date_range',
-                'start_date': start_date_str,
-                'end_date': end_date_str,
-                'total_dates': total_dates,
-                'success_count': success_count,
-                'failed_dates': failed_dates,
-                'games_scraped': scraper.games_scraped,
-                'execution_time_seconds': time.time() - start_time
-            }
 
         else:
             error_msg = f"Invalid mode: {mode}. Must be one of: day, month, date_range"
             logger.error(error_msg)
-            return {
-                'statusCode': 400,
-                'body': json.dumps({
-                    'success': False,
-                    'error': error_msg
-                })
-            }
+            return _error_response(400, error_msg)
 
         # Add common fields to result
         result.update({
@@ -484,22 +619,13 @@ def handle_legacy_format(event, context):
             'architecture_version': architecture_version
         })
 
-        logger.info(f"Scraping complete in {time.time() - start_time:.2f} seconds")
+        logger.info("Scraping complete in %.2f seconds", time.time() - start_time)
 
-        return {
-            'statusCode': 200,
-            'body': json.dumps(result)
-        }
+        return _response(200, result)
 
     except Exception as e:
         logger.error(f"Error in handle_legacy_format: {str(e)}", exc_info=True)
-        return {
-            'statusCode': 500,
-            'body': json.dumps({
-                'success': False,
-                'error': str(e)
-            })
-        }
+        return _error_response(500, str(e))
 
 if __name__ == "__main__":
     # For local testing
@@ -0,0 +1,109 @@
+"""
+Batched saves for scrape status kept in memory and saved as one document.
+
+Lookups and the v2 checkpoint rewrite their whole document on every save, so
+inside batched() they only save every flush_every updates instead of per date.
+"""
+
+import logging
+import threading
+from contextlib import contextmanager
+from typing import List
+
+logger = logging.getLogger(__name__)
+
+class BatchedSaves:
+    """
+    Mixin deferring a document's saves inside batched() blocks.
+
+    Subclasses call _init_batching() from __init__, implement _save(), and call
+    _record_update() with self._lock held after changing a date in memory.
+    """
+
+    # Maximum updates held in memory inside batched() before saving
+    flush_every = 25
+    # Number of batched() blocks currently open
+    _deferred = 0
+
+    def _init_batching(self) -> None:
+        # The scraper updates dates from its worker threads
+        self._lock = threading.Lock()
+        self._pending = 0
+        # Dates updated in memory but not yet saved
+        self._unsaved_dates = set()
+
+    def _save(self) -> bool:
+        """
+        Save the whole document; called with self._lock held.
+
+        Returns:
+            Boolean indicating success
+        """
+        raise NotImplementedError
+
+    def _save_pending(self) -> bool:
+        """Save with self._lock held, keeping updates pending if the save fails"""
+        if not self._save():
+            return False
+        self._pending = 0
+        self._unsaved_dates.clear()
+        return True
+
+    def _record_update(self, date_str: str) -> bool:
+        """
+        Count an update to date_str made with self._lock held, saving now unless a
+        batched() block defers it.
+
+        Returns:
+            Boolean indicating the update was saved or buffered
+        """
+        self._unsaved_dates.add(date_str)
+        self._pending += 1
+        # Inside batched(), only save every flush_every updates so a timeout or
+        # crash mid-range loses at most that many dates
+        if self._deferred and self._pending < self.flush_every:
+            return True
+        return self._save_pending()
+
+    def flush(self) -> bool:
+        """
+        Save any updates buffered inside batched(). Updates stay buffered if the
+        save fails, so a later flush retries them.
+
+        Returns:
+            Boolean indicating success
+        """
+        with self._lock:
+            if not self._pending:
+                return True
+            return self._save_pending()
+
+    def get_unsaved_dates(self) -> List[str]:
+        """
+        Get dates that were updated but whose save hasn't succeeded.
+
+        Returns:
+            Sorted list of date strings
+        """
+        with self._lock:
+            return sorted(self._unsaved_dates)
+
+    @contextmanager
+    def batched(self):
+        """
+        Buffer updates inside the block, saving every flush_every updates and once
+        more on exit instead of after every date.
+
+        Blocks may overlap, e.g. concurrent months sharing one lookup or checkpoint.
+        Each block saves everything pending when it exits, including updates made
+        by blocks that are still open.
+        """
+        with self._lock:
+            self._deferred += 1
+        try:
+            yield self
+        finally:
+            with self._lock:
+                self._deferred -= 1
+            if not self.flush():
+                logger.error(f"Failed to save after batched updates; unsaved dates: {self.get_unsaved_dates()}")
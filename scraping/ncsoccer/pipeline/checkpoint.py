@@ -6,17 +6,26 @@ This module provides a consistent interface for all checkpointing operations.
 import os
 import json
 import logging
+import random
+import time
 from datetime import datetime
 from typing import Dict, Any, List, Optional, Union
 
+from ncsoccer.pipeline.batching import BatchedSaves
+
 logger = logging.getLogger(__name__)
 
-class UnifiedCheckpoint:
+class UnifiedCheckpoint(BatchedSaves):
     """
     Unified checkpoint system that maintains a single checkpoint file
     with sections for different processes (scraping, processing, conversion).
     """
 
+    # Seconds a remote save keeps retrying while other writers keep winning; the
+    # backoff between attempts grows, so more writers means fewer, wider-spaced tries
+    save_timeout = 30
+    max_save_delay = 2.0
+
     def __init__(self, checkpoint_file: str, storage_interface=None):
         """
         Initialize the checkpoint system.
@@ -27,6 +36,7 @@ class UnifiedCheckpoint:
         """
         self.checkpoint_file = checkpoint_file
         self.storage = storage_interface
+        self._init_batching()
 
         # Detect Lambda environment
         self.in_lambda = 'AWS_LAMBDA_FUNCTION_NAME' in os.environ
@@ -66,20 +76,19 @@ class UnifiedCheckpoint:
 
         # Check if file exists
         if self.storage:
-            # Remote storage (e.g., S3)
-            exists = self.storage.exists(self.checkpoint_file)
-            if exists:
-                try:
-                    content = self.storage.read(self.checkpoint_file)
-                    data = json.loads(content)
-                    return data
-                except Exception as e:
-                    logger.error(f"Error loading checkpoint: {e}")
-                    return default_data
+            # Remote storage (e.g., S3). Read first and only check existence if that
+            # fails; the cached read skips the download when the checkpoint is unchanged
+            try:
+                return json.loads(self.storage.read_cached(self.checkpoint_file))
+            except Exception as e:
+                read_error = e
+            if self.storage.exists(self.checkpoint_file):
+                logger.error(f"Error loading checkpoint: {read_error}")
+                return default_data
             else:
-                # Create new checkpoint file
+                # Create new checkpoint file, unless another writer just created one
                 try:
-                    self.storage.write(self.checkpoint_file, json.dumps(default_data, indent=2))
+                    self.storage.write_versioned(self.checkpoint_file, json.dumps(default_data, indent=2), None)
                 except Exception as e:
                     logger.error(f"Error creating checkpoint: {e}")
                 return default_data
@@ -118,17 +127,33 @@ class UnifiedCheckpoint:
         Returns:
             Boolean indicating success
         """
-        # Update timestamp
-        self._data['last_updated'] = datetime.now().isoformat()
-
         try:
             if self.storage:
-                # Remote storage (e.g., S3)
-                return self.storage.write(
-                    self.checkpoint_file,
-                    json.dumps(self._data, indent=2)
-                )
+                # Remote storage (e.g., S3) may have other writers, such as the
+                # single-day Lambdas of a fan-out. Merge in what they saved since we
+                # loaded, then write only if nobody saved in between; retry otherwise
+                deadline = time.monotonic() + self.save_timeout
+                delay = 0.05
+                attempts = 0
+                while True:
+                    attempts += 1
+                    content, version = self.storage.read_versioned(self.checkpoint_file)
+                    if content:
+                        self._merge(json.loads(content))
+                    self._data['last_updated'] = datetime.now().isoformat()
+                    if self.storage.write_versioned(self.checkpoint_file, json.dumps(self._data, indent=2), version):
+                        return True
+                    if time.monotonic() >= deadline:
+                        break
+                    # Exponential backoff with full jitter, so colliding writers spread out
+                    time.sleep(random.uniform(0, delay))
+                    delay = min(delay * 2, self.max_save_delay)
+                logger.error(f"Error saving checkpoint: still changing after {attempts} attempts in {self.save_timeout}s")
+                return False
             else:
+                # Update timestamp
+                self._data['last_updated'] = datetime.now().isoformat()
+
                 # Local file storage
                 # Detect Lambda environment
                 in_lambda = 'AWS_LAMBDA_FUNCTION_NAME' in os.environ
@@ -144,6 +169,21 @@ class UnifiedCheckpoint:
             logger.error(f"Error saving checkpoint: {e}")
             return False
 
+    def _save(self) -> bool:
+        return self._save_checkpoint()
+
+    def _merge(self, saved: Dict[str, Any]) -> None:
+        """
+        Add dates from a saved checkpoint that this copy doesn't have yet.
+
+        Args:
+            saved: Checkpoint data as currently stored
+        """
+        for section in ('scraping', 'processing'):
+            completed = self._data.setdefault(section, {}).setdefault('completed_dates', {})
+            for date_str, entry in saved.get(section, {}).get('completed_dates', {}).items():
+                completed.setdefault(date_str, entry)
+
     def update_scraping(self, date_str: str, success: bool = True, games_count: int = 0, force: bool = False) -> bool:
         """
         Update scraping status for a specific date.
@@ -158,30 +198,31 @@ class UnifiedCheckpoint:
             Boolean indicating success
         """
         try:
-            # Make sure the structure exists
-            if 'scraping' not in self._data:
-                self._data['scraping'] = {'completed_dates': {}}
-            if 'completed_dates' not in self._data['scraping']:
-                self._data['scraping']['completed_dates'] = {}
-
-            # Update timestamp
-            self._data['scraping']['last_updated'] = datetime.now().isoformat()
-
-            # Check if date already exists and we're not forcing
-            if not force and date_str in self._data['scraping']['completed_dates']:
-                existing = self._data['scraping']['completed_dates'][date_str]
-                logger.info(f"Date {date_str} already exists in checkpoint with status {existing.get('status')} and games_count {existing.get('games_count')}. Not updating.")
-                return True
-
-            # Update date status
-            self._data['scraping']['completed_dates'][date_str] = {
-                'status': 'success' if success else 'failed',
-                'games_count': games_count,
-                'timestamp': datetime.now().isoformat()
-            }
+            with self._lock:
+                # Make sure the structure exists
+                if 'scraping' not in self._data:
+                    self._data['scraping'] = {'completed_dates': {}}
+                if 'completed_dates' not in self._data['scraping']:
+                    self._data['scraping']['completed_dates'] = {}
+
+                # Update timestamp
+                self._data['scraping']['last_updated'] = datetime.now().isoformat()
+
+                # Check if date already exists and we're not forcing
+                if not force and date_str in self._data['scraping']['completed_dates']:
+                    existing = self._data['scraping']['completed_dates'][date_str]
+                    logger.info(f"Date {date_str} already exists in checkpoint with status {existing.get('status')} and games_count {existing.get('games_count')}. Not updating.")
+                    return True
+
+                # Update date status
+                self._data['scraping']['completed_dates'][date_str] = {
+                    'status': 'success' if success else 'failed',
+                    'games_count': games_count,
+                    'timestamp': datetime.now().isoformat()
+                }
+
+                save_result = self._record_update(date_str)
 
-            # Save the checkpoint
-            save_result = self._save_checkpoint()
             if save_result:
                 logger.info(f"Successfully updated checkpoint for {date_str} with status {'success' if success else 'failed'} and games_count {games_count}")
             else:
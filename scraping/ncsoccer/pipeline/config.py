@@ -1,9 +1,12 @@
 from dataclasses import dataclass
 from typing import Optional, Union
 from datetime import datetime, timedelta
+from calendar import monthrange
 from enum import Enum
 import os
 import boto3
+from botocore.config import Config
+from botocore.exceptions import ClientError
 import logging
 import time
 
@@ -37,10 +40,8 @@ class ScraperConfig:
         elif self.mode == ScrapeMode.WEEK:
             return self.start_date + timedelta(days=6)
         else:  # MONTH
-            if self.start_date.month == 12:
-                return datetime(self.start_date.year + 1, 1, 1) - timedelta(days=1)
-            else:
-                return datetime(self.start_date.year, self.start_date.month + 1, 1) - timedelta(days=1)
+            year, month = self.start_date.year, self.start_date.month
+            return datetime(year, month, monthrange(year, month)[1])
 
 class DataPathManager:
     """
@@ -211,6 +212,29 @@ class StorageInterface:
         """Read content from a path"""
         raise NotImplementedError
 
+    def read_cached(self, path: str) -> str:
+        """Read a small, frequently re-read object such as a checkpoint; may be cached"""
+        return self.read(path)
+
+    def read_versioned(self, path: str) -> tuple:
+        """Read content with a version tag for write_versioned; (None, None) if missing"""
+        if not self.exists(path):
+            return None, None
+        return self.read(path), None
+
+    def write_versioned(self, path: str, content: str, version) -> bool:
+        """Write content only if the path is unchanged since read_versioned returned version.
+
+        Returns False if another writer got there first; raises on other errors.
+        Unversioned storage has a single writer, so this is a plain write."""
+        if not self.write(path, content):
+            raise IOError(f"Failed to write {path}")
+        return True
+
+    def list_keys(self, prefix: str) -> dict:
+        """List the paths under a prefix, mapped to their sizes in bytes"""
+        raise NotImplementedError
+
 class FileStorage(StorageInterface):
     def __init__(self):
         """Initialize the FileStorage interface"""
@@ -260,9 +284,40 @@ class FileStorage(StorageInterface):
         with open(local_path, 'r', encoding='utf-8') as f:
             return f.read()
 
+    def list_keys(self, prefix: str) -> dict:
+        local_prefix = f"{self.tmp_prefix}{prefix}"
+        keys = {}
+        pending = [os.path.dirname(local_prefix) or '.']
+        while pending:
+            try:
+                entries = os.scandir(pending.pop())
+            except FileNotFoundError:
+                continue
+            with entries:
+                for entry in entries:
+                    # Skip whole subtrees outside the prefix rather than walking them
+                    if not entry.path.startswith(local_prefix):
+                        continue
+                    if entry.is_dir(follow_symlinks=False):
+                        pending.append(entry.path)
+                    else:
+                        keys[entry.path[len(self.tmp_prefix):]] = entry.stat().st_size
+        return keys
+
+# Objects read through S3Storage.read_cached, keyed by (bucket, key) and holding
+# (etag, content). Module level, so a warm Lambda only re-downloads them when changed
+_S3_READ_CACHE = {}
+
 class S3Storage(StorageInterface):
-    def __init__(self, bucket_name: str, region: str = "us-east-2"):
-        self.s3 = boto3.client('s3', region_name=region)
+    def __init__(self, bucket_name: str, region: str = "us-east-2", client=None):
+        # Callers that outlive one scrape (e.g. a warm Lambda) can pass a shared client.
+        # Otherwise leave room for the scraper's worker threads and concurrent existence
+        # checks, with adaptive retries so a burst of PUTs backs off on throttling
+        self.s3 = client or boto3.client('s3', region_name=region, config=Config(
+            max_pool_connections=64,
+            retries={'max_attempts': 10, 'mode': 'adaptive'},
+            tcp_keepalive=True
+        ))
         self.bucket = bucket_name
         self.logger = logging.getLogger(__name__)
 
@@ -275,7 +330,8 @@ class S3Storage(StorageInterface):
 
     def write(self, path: str, content: str) -> bool:
         try:
-            self.logger.info(f"S3Storage: Writing to {self.bucket}/{path} (content length: {len(content)} bytes)")
+            # Per-object logging is debug-only: a month writes hundreds of objects
+            self.logger.debug("S3Storage: Writing to %s/%s (content length: %d bytes)", self.bucket, path, len(content))
             write_start = time.time()
 
             self.s3.put_object(
@@ -285,17 +341,11 @@ class S3Storage(StorageInterface):
                 ContentType='text/html' if path.endswith('.html') else 'application/json'
             )
 
+            # A successful PUT is immediately readable (S3 is strongly consistent),
+            # so no HEAD is needed to confirm it; callers verify in bulk via list_keys
             write_duration = time.time() - write_start
-            self.logger.info(f"S3Storage: Successfully wrote to {self.bucket}/{path} in {write_duration:.2f}s")
-
-            # Verify the file was actually written
-            try:
-                self.s3.head_object(Bucket=self.bucket, Key=path)
-                self.logger.info(f"S3Storage: Successfully verified {self.bucket}/{path} exists after write")
-                return True
-            except Exception as e:
-                self.logger.error(f"S3Storage: File verification failed for {self.bucket}/{path}: {str(e)}")
-                return False
+            self.logger.debug("S3Storage: Successfully wrote to %s/%s in %.2fs", self.bucket, path, write_duration)
+            return True
 
         except Exception as e:
             self.logger.error(f"S3Storage: Failed to write to {self.bucket}/{path}: {str(e)}")
@@ -305,13 +355,67 @@ class S3Storage(StorageInterface):
         response = self.s3.get_object(Bucket=self.bucket, Key=path)
         return response['Body'].read().decode('utf-8')
 
-def get_storage_interface(storage_type: str | StorageType, bucket_name: str = None, region: str = "us-east-2") -> StorageInterface:
+    def read_cached(self, path: str) -> str:
+        # Conditional GET: S3 answers 304 with no body while our copy is current
+        cache_key = (self.bucket, path)
+        cached = _S3_READ_CACHE.get(cache_key)
+        try:
+            if cached:
+                response = self.s3.get_object(Bucket=self.bucket, Key=path, IfNoneMatch=cached[0])
+            else:
+                response = self.s3.get_object(Bucket=self.bucket, Key=path)
+        except ClientError as e:
+            if cached and e.response.get('Error', {}).get('Code') in ('304', 'NotModified'):
+                return cached[1]
+            raise
+        content = response['Body'].read().decode('utf-8')
+        _S3_READ_CACHE[cache_key] = (response['ETag'], content)
+        return content
+
+    def read_versioned(self, path: str) -> tuple:
+        try:
+            response = self.s3.get_object(Bucket=self.bucket, Key=path)
+        except ClientError as e:
+            if e.response.get('Error', {}).get('Code') in ('NoSuchKey', '404'):
+                return None, None
+            raise
+        return response['Body'].read().decode('utf-8'), response['ETag']
+
+    def write_versioned(self, path: str, content: str, version) -> bool:
+        # Conditional PUT: S3 rejects it if the object changed (or, when creating,
+        # appeared) since it was read, so concurrent writers can't drop each other's updates
+        condition = {'IfMatch': version} if version else {'IfNoneMatch': '*'}
+        try:
+            self.s3.put_object(
+                Bucket=self.bucket,
+                Key=path,
+                Body=content.encode('utf-8'),
+                ContentType='application/json',
+                **condition
+            )
+        except ClientError as e:
+            if e.response.get('Error', {}).get('Code') in ('PreconditionFailed', 'ConditionalRequestConflict', '412', '409'):
+                return False
+            raise
+        return True
+
+    def list_keys(self, prefix: str) -> dict:
+        keys = {}
+        paginator = self.s3.get_paginator('list_objects_v2')
+        for page in paginator.paginate(Bucket=self.bucket, Prefix=prefix, PaginationConfig={'PageSize': 1000}):
+            for obj in page.get('Contents', []):
+                keys[obj['Key']] = obj['Size']
+        return keys
+
+def get_storage_interface(storage_type: str | StorageType, bucket_name: str = None, region: str = "us-east-2",
+                          client=None) -> StorageInterface:
     """Get the appropriate storage interface based on type
 
     Args:
         storage_type (Union[str, StorageType]): Type of storage to use ('file' or 's3')
         bucket_name (str, optional): Name of S3 bucket for S3 storage. Defaults to None.
         region (str, optional): AWS region for S3 storage. Defaults to "us-east-2".
+        client (optional): Existing boto3 S3 client to reuse for S3 storage. Defaults to None.
 
     Returns:
         StorageInterface: The configured storage interface
@@ -333,7 +437,7 @@ def get_storage_interface(storage_type: str | StorageType, bucket_name: str = No
     elif storage_type == StorageType.S3:
         if not bucket_name:
             bucket_name = os.environ.get('DATA_BUCKET', 'ncsh-app-data')
-        return S3Storage(bucket_name, region=region)
+        return S3Storage(bucket_name, region=region, client=client)
     raise ValueError(f"Unsupported storage type: {storage_type}")
 
 @dataclass
@@ -1,12 +1,38 @@
 from abc import ABC, abstractmethod
+from contextlib import contextmanager
 import json
 from datetime import datetime
 import os
-from typing import Dict, Any, Optional
+import sqlite3
+import tempfile
+import threading
+import orjson
+from typing import Dict, Any, List, Optional
 import logging
+from ncsoccer.pipeline.batching import BatchedSaves
 
 logger = logging.getLogger(__name__)
 
+def write_json_atomic(path: str, data: Any, indent: bool = False) -> None:
+    """Write data as JSON to a temporary file, then rename it over path
+
+    A crash mid-write leaves the previous file intact instead of a truncated one,
+    and concurrent writers never interleave inside the same file.
+
+    Args:
+        path: Destination file path
+        data: JSON-serializable data
+        indent: Whether to pretty-print with two-space indentation
+    """
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path) or '.', suffix='.tmp')
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            f.write(orjson.dumps(data, option=orjson.OPT_INDENT_2 if indent else 0))
+        os.replace(tmp_path, path)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
+
 class Lookup(ABC):
     """Base interface for lookup implementations"""
 
@@ -20,7 +46,46 @@ class Lookup(ABC):
         """Update the lookup data for a date"""
         pass
 
-class LocalFileLookup(Lookup):
+    def flush(self) -> bool:
+        """Save any updates buffered inside batched() (no-op for write-through lookups)"""
+        return True
+
+    def get_unsaved_dates(self) -> List[str]:
+        """Dates updated but not yet saved (none for write-through lookups)"""
+        return []
+
+    @contextmanager
+    def batched(self):
+        """Group updates into fewer saves (no-op for write-through lookups)"""
+        yield self
+
+class _BufferedLookup(BatchedSaves, Lookup):
+    """Lookup that keeps scraped dates in memory and saves them as one document"""
+
+    @abstractmethod
+    def _save_lookup_data(self) -> bool:
+        pass
+
+    def _save(self) -> bool:
+        return self._save_lookup_data()
+
+    def update_date(self, date_str: str, success: bool = True, games_count: int = 0) -> None:
+        """Update status for a date
+
+        Args:
+            date_str: Date string in YYYY-MM-DD format
+            success: Whether scraping was successful
+            games_count: Number of games scraped
+        """
+        with self._lock:
+            self.scraped_dates[date_str] = {
+                'success': success,
+                'games_count': games_count,
+                'timestamp': datetime.now().isoformat()
+            }
+            self._record_update(date_str)
+
+class LocalFileLookup(_BufferedLookup):
     """Local file implementation of the lookup interface"""
 
     def __init__(self, lookup_file: str = 'data/lookup.json', architecture_version: str = 'v1', **kwargs):
@@ -33,6 +98,7 @@ class LocalFileLookup(Lookup):
         """
         self.lookup_file = lookup_file
         self.architecture_version = architecture_version
+        self._init_batching()
         self.scraped_dates = self._load_lookup_data()
 
     def _load_lookup_data(self) -> Dict[str, Any]:
@@ -62,8 +128,7 @@ class LocalFileLookup(Lookup):
                 # Legacy v1 structure
                 initial_data = {'scraped_dates': {}}
 
-            with open(self.lookup_file, 'w') as f:
-                json.dump(initial_data, f, indent=2)
+            write_json_atomic(self.lookup_file, initial_data, indent=True)
 
             # For v2, return empty dict for backward compatibility with existing code
             if self.architecture_version == 'v2':
@@ -72,8 +137,8 @@ class LocalFileLookup(Lookup):
                 return {}
 
         try:
-            with open(self.lookup_file, 'r') as f:
-                data = json.load(f)
+            with open(self.lookup_file, 'rb') as f:
+                data = orjson.loads(f.read())
 
                 # Handle different structures based on architecture version
                 if self.architecture_version == 'v2':
@@ -96,14 +161,14 @@ class LocalFileLookup(Lookup):
             logger.error(f"Error loading lookup file: {e}")
             return {}
 
-    def _save_lookup_data(self) -> None:
+    def _save_lookup_data(self) -> bool:
         """Save lookup data to file"""
         try:
             if self.architecture_version == 'v2':
                 # Load existing data first to preserve other sections
                 if os.path.exists(self.lookup_file):
-                    with open(self.lookup_file, 'r') as f:
-                        data = json.load(f)
+                    with open(self.lookup_file, 'rb') as f:
+                        data = orjson.loads(f.read())
                 else:
                     data = {
                         'version': 'v2',
@@ -129,10 +194,11 @@ class LocalFileLookup(Lookup):
                 # Legacy v1 structure
                 data = {'scraped_dates': self.scraped_dates}
 
-            with open(self.lookup_file, 'w') as f:
-                json.dump(data, f, indent=2)
+            write_json_atomic(self.lookup_file, data, indent=True)
+            return True
         except Exception as e:
             logger.error(f"Failed to save lookup data: {e}")
+            return False
 
     def is_date_scraped(self, date_str: str) -> bool:
         """Check if a date has been successfully scraped
@@ -145,21 +211,6 @@ class LocalFileLookup(Lookup):
         """
         return date_str in self.scraped_dates and self.scraped_dates[date_str]['success']
 
-    def update_date(self, date_str: str, success: bool = True, games_count: int = 0) -> None:
-        """Update status for a date
-
-        Args:
-            date_str: Date string in YYYY-MM-DD format
-            success: Whether scraping was successful
-            games_count: Number of games scraped
-        """
-        self.scraped_dates[date_str] = {
-            'success': success,
-            'games_count': games_count,
-            'timestamp': datetime.now().isoformat()
-        }
-        self._save_lookup_data()
-
     def update_processing_status(self, date_str: str, success: bool = True) -> None:
         """Update processing status for a date (v2 only)
 
@@ -171,8 +222,8 @@ class LocalFileLookup(Lookup):
             return
 
         try:
-            with open(self.lookup_file, 'r') as f:
-                data = json.load(f)
+            with open(self.lookup_file, 'rb') as f:
+                data = orjson.loads(f.read())
 
             if 'processing' not in data:
                 data['processing'] = {'completed_dates': {}}
@@ -186,8 +237,7 @@ class LocalFileLookup(Lookup):
                 'timestamp': datetime.now().isoformat()
             }
 
-            with open(self.lookup_file, 'w') as f:
-                json.dump(data, f, indent=2)
+            write_json_atomic(self.lookup_file, data, indent=True)
         except Exception as e:
             logger.error(f"Failed to update processing status: {e}")
 
@@ -202,8 +252,8 @@ class LocalFileLookup(Lookup):
             return
 
         try:
-            with open(self.lookup_file, 'r') as f:
-                data = json.load(f)
+            with open(self.lookup_file, 'rb') as f:
+                data = orjson.loads(f.read())
 
             if 'parquet_conversion' not in data:
                 data['parquet_conversion'] = {}
@@ -214,12 +264,11 @@ class LocalFileLookup(Lookup):
             if version:
                 data['parquet_conversion']['version'] = version
 
-            with open(self.lookup_file, 'w') as f:
-                json.dump(data, f, indent=2)
+            write_json_atomic(self.lookup_file, data, indent=True)
         except Exception as e:
             logger.error(f"Failed to update parquet conversion status: {e}")
 
-class S3Lookup(Lookup):
+class S3Lookup(_BufferedLookup):
     """S3 implementation of the lookup interface"""
 
     def __init__(self, lookup_file: str = 'data/lookup.json', bucket_name: str = None,
@@ -242,6 +291,7 @@ class S3Lookup(Lookup):
         from ncsoccer.pipeline.config import get_storage_interface
         self.storage = get_storage_interface('s3', bucket_name, region=region)
 
+        self._init_batching()
         self.scraped_dates = self._load_lookup_data()
 
     def _load_lookup_data(self) -> Dict[str, Any]:
@@ -280,7 +330,7 @@ class S3Lookup(Lookup):
                     return {}
 
             # Read data from S3
-            data = json.loads(self.storage.read(self.lookup_file))
+            data = orjson.loads(self.storage.read_cached(self.lookup_file))
 
             # Handle different structures based on architecture version
             if self.architecture_version == 'v2':
@@ -303,13 +353,13 @@ class S3Lookup(Lookup):
             logger.error(f"Error loading lookup file from S3: {e}")
             return {}
 
-    def _save_lookup_data(self) -> None:
+    def _save_lookup_data(self) -> bool:
         """Save lookup data to S3"""
         try:
             # First read existing data to preserve other sections
             try:
                 if self.storage.exists(self.lookup_file):
-                    data = json.loads(self.storage.read(self.lookup_file))
+                    data = orjson.loads(self.storage.read(self.lookup_file))
                 else:
                     if self.architecture_version == 'v2':
                         data = {
@@ -352,10 +402,11 @@ class S3Lookup(Lookup):
                 data['scraped_dates'] = self.scraped_dates
 
             # Write to S3
-            self.storage.write(self.lookup_file, json.dumps(data, indent=2))
+            return self.storage.write(self.lookup_file, json.dumps(data, indent=2))
 
         except Exception as e:
             logger.error(f"Failed to save lookup data to S3: {e}")
+            return False
 
     def is_date_scraped(self, date_str: str) -> bool:
         """Check if a date has been successfully scraped
@@ -368,21 +419,6 @@ class S3Lookup(Lookup):
         """
         return date_str in self.scraped_dates and self.scraped_dates[date_str]['success']
 
-    def update_date(self, date_str: str, success: bool = True, games_count: int = 0) -> None:
-        """Update status for a date
-
-        Args:
-            date_str: Date string in YYYY-MM-DD format
-            success: Whether scraping was successful
-            games_count: Number of games scraped
-        """
-        self.scraped_dates[date_str] = {
-            'success': success,
-            'games_count': games_count,
-            'timestamp': datetime.now().isoformat()
-        }
-        self._save_lookup_data()
-
     def update_processing_status(self, date_str: str, success: bool = True) -> None:
         """Update processing status for a date (v2 only)
 
@@ -394,7 +430,7 @@ class S3Lookup(Lookup):
             return
 
         try:
-            data = json.loads(self.storage.read(self.lookup_file))
+            data = orjson.loads(self.storage.read(self.lookup_file))
 
             if 'processing' not in data:
                 data['processing'] = {'completed_dates': {}}
@@ -423,7 +459,7 @@ class S3Lookup(Lookup):
             return
 
         try:
-            data = json.loads(self.storage.read(self.lookup_file))
+            data = orjson.loads(self.storage.read(self.lookup_file))
 
             if 'parquet_conversion' not in data:
                 data['parquet_conversion'] = {}
@@ -438,6 +474,113 @@ class S3Lookup(Lookup):
         except Exception as e:
             logger.error(f"Failed to update parquet conversion status in S3: {e}")
 
+class SQLiteLookup(Lookup):
+    """SQLite implementation of the lookup interface
+
+    Each date is a row keyed by its date string, so membership checks hit the
+    primary key index and updates write a single row instead of rewriting the
+    whole lookup file.
+    """
+
+    def __init__(self, lookup_file: str = 'data/lookup.db', architecture_version: str = 'v1', **kwargs):
+        """Initialize SQLite lookup
+
+        Args:
+            lookup_file (str): Path to the lookup database (ending in .db)
+            architecture_version (str): 'v1' for legacy or 'v2' for new architecture
+            **kwargs: Additional arguments (ignored, for compatibility)
+        """
+        self.lookup_file = lookup_file
+        self.architecture_version = architecture_version
+        self._lock = threading.Lock()
+
+        directory = os.path.dirname(lookup_file)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        # The scraper checks and updates dates from its worker threads
+        self.conn = sqlite3.connect(lookup_file, check_same_thread=False)
+        with self._lock, self.conn:
+            self.conn.execute(
+                'CREATE TABLE IF NOT EXISTS scraped ('
+                'date TEXT PRIMARY KEY, success INTEGER NOT NULL, '
+                'games_count INTEGER NOT NULL DEFAULT 0, timestamp TEXT)'
+            )
+        self._migrate_json_lookup()
+
+    def _migrate_json_lookup(self) -> None:
+        """Import dates from the JSON lookup file next to the database, if any.
+
+        Only a new, empty database imports it; after that the database is the
+        lookup and the JSON file is no longer read.
+        """
+        json_file = os.path.splitext(self.lookup_file)[0] + '.json'
+        if not os.path.exists(json_file):
+            return
+        with self._lock:
+            if self.conn.execute('SELECT 1 FROM scraped LIMIT 1').fetchone():
+                return
+
+        scraped_dates = LocalFileLookup(
+            lookup_file=json_file,
+            architecture_version=self.architecture_version
+        ).scraped_dates
+        if not scraped_dates:
+            return
+
+        rows = [
+            (date_str, int(bool(info.get('success'))), info.get('games_count', 0), info.get('timestamp'))
+            for date_str, info in scraped_dates.items()
+        ]
+        with self._lock, self.conn:
+            self.conn.executemany('INSERT OR IGNORE INTO scraped VALUES (?, ?, ?, ?)', rows)
+        logger.info(f"Migrated {len(rows)} dates from {json_file} into {self.lookup_file}")
+
+    @property
+    def scraped_dates(self) -> Dict[str, Any]:
+        """All dates in the same dict format the JSON lookups keep in memory"""
+        with self._lock:
+            rows = self.conn.execute('SELECT date, success, games_count, timestamp FROM scraped').fetchall()
+        return {
+            date_str: {'success': bool(success), 'games_count': games_count, 'timestamp': timestamp}
+            for date_str, success, games_count, timestamp in rows
+        }
+
+    def is_date_scraped(self, date_str: str) -> bool:
+        """Check if a date has been successfully scraped
+
+        Args:
+            date_str: Date string in YYYY-MM-DD format
+
+        Returns:
+            bool: True if date has been successfully scraped, False otherwise
+        """
+        with self._lock:
+            row = self.conn.execute('SELECT success FROM scraped WHERE date = ?', (date_str,)).fetchone()
+        return bool(row and row[0])
+
+    def update_date(self, date_str: str, success: bool = True, games_count: int = 0) -> None:
+        """Update status for a date
+
+        Args:
+            date_str: Date string in YYYY-MM-DD format
+            success: Whether scraping was successful
+            games_count: Number of games scraped
+        """
+        try:
+            with self._lock, self.conn:
+                self.conn.execute(
+                    'INSERT OR REPLACE INTO scraped VALUES (?, ?, ?, ?)',
+                    (date_str, int(success), games_count, datetime.now().isoformat())
+                )
+        except sqlite3.Error as e:
+            logger.error(f"Failed to save lookup data to SQLite: {e}")
+
+    def close(self) -> None:
+        """Close the database connection"""
+        with self._lock:
+            self.conn.close()
+
 def get_lookup_interface(lookup_type: str = 'file', architecture_version: str = 'v1', **kwargs) -> Lookup:
     """Factory function to get the appropriate lookup interface
 
@@ -445,7 +588,8 @@ def get_lookup_interface(lookup_type: str = 'file', architecture_version: str =
         lookup_type (str, optional): Type of lookup to use. 'file' or 's3'. Defaults to 'file'.
         architecture_version (str, optional): 'v1' for legacy or 'v2' for new architecture. Defaults to 'v1'.
         **kwargs: Additional arguments to pass to the lookup interface:
-            - lookup_file (str): Path to lookup file (for file and s3 lookup)
+            - lookup_file (str): Path to lookup file (for file and s3 lookup); a
+              local file ending in .db is stored in SQLite
             - bucket_name (str): S3 bucket name (for s3 lookup)
             - region (str): AWS region (for s3 lookup)
 
@@ -457,6 +601,8 @@ def get_lookup_interface(lookup_type: str = 'file', architecture_version: str =
     """
     if lookup_type == 'file':
         kwargs['architecture_version'] = architecture_version
+        if str(kwargs.get('lookup_file', '')).endswith('.db'):
+            return SQLiteLookup(**kwargs)
         return LocalFileLookup(**kwargs)
     elif lookup_type == 's3':
         kwargs['architecture_version'] = architecture_version
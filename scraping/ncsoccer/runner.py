@@ -4,10 +4,16 @@
 import os
 import json
 import time
+import threading
+import orjson
 import argparse
 import logging
-from datetime import datetime, timedelta
+from datetime import datetime
+from functools import lru_cache
 from calendar import monthrange
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+from ncsoccer.pipeline.lookup import write_json_atomic
 
 # Configure root logger
 logging.basicConfig(
@@ -17,11 +23,30 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# Number of storage existence checks run concurrently when verifying outputs
+VERIFY_WORKERS = 32
+
+# Parsed local lookup files keyed by (path, mtime), reused across warm Lambda invocations
+_LOOKUP_CACHE = {}
+
+# Open SQLite lookups keyed by path, so repeated loads and updates share one connection
+_SQLITE_LOOKUPS = {}
+_SQLITE_LOOKUPS_LOCK = threading.Lock()
+
+def _sqlite_lookup(lookup_file):
+    """Get the shared SQLiteLookup for a .db lookup file, opening it on first use"""
+    with _SQLITE_LOOKUPS_LOCK:
+        if lookup_file not in _SQLITE_LOOKUPS:
+            from ncsoccer.pipeline.lookup import SQLiteLookup
+            _SQLITE_LOOKUPS[lookup_file] = SQLiteLookup(lookup_file=lookup_file)
+        return _SQLITE_LOOKUPS[lookup_file]
+
 def load_lookup_data(lookup_file='data/lookup.json', storage_type='file', bucket_name=None, region='us-east-2'):
     """Load the lookup data from JSON file or S3.
 
     Args:
-        lookup_file (str): Path to the lookup JSON file.
+        lookup_file (str): Path to the lookup JSON file, or a local .db file
+            for the SQLite lookup.
         storage_type (str): 'file' or 's3'
         bucket_name (str): S3 bucket name if storage_type is 's3'
         region (str): AWS region for S3
@@ -52,7 +77,7 @@ def load_lookup_data(lookup_file='data/lookup.json', storage_type='file', bucket
                 return {}
 
             # Read lookup data from S3
-            data = json.loads(storage.read(lookup_file))
+            data = orjson.loads(storage.read(lookup_file))
             return data.get('scraped_dates', {})
         except Exception as e:
             logger.error(f"Error loading lookup file from S3: {e}")
@@ -60,15 +85,23 @@ def load_lookup_data(lookup_file='data/lookup.json', storage_type='file', bucket
     else:
         # Local file system
         try:
+            if lookup_file.endswith('.db'):
+                return _sqlite_lookup(lookup_file).scraped_dates
+
             if not os.path.exists(lookup_file):
                 os.makedirs(os.path.dirname(lookup_file), exist_ok=True)
-                with open(lookup_file, 'w') as f:
-                    json.dump({'scraped_dates': {}}, f)
+                write_json_atomic(lookup_file, {'scraped_dates': {}})
                 return {}
 
-            with open(lookup_file, 'r') as f:
-                data = json.load(f)
-                return data.get('scraped_dates', {})
+            cache_key = (lookup_file, os.stat(lookup_file).st_mtime_ns)
+            if cache_key not in _LOOKUP_CACHE:
+                with open(lookup_file, 'rb') as f:
+                    data = orjson.loads(f.read())
+                _LOOKUP_CACHE.clear()
+                _LOOKUP_CACHE[cache_key] = data.get('scraped_dates', {})
+
+            # Callers update the dict they get back, so hand out a copy
+            return dict(_LOOKUP_CACHE[cache_key])
         except Exception as e:
             logger.error(f"Error loading lookup file from local filesystem: {e}")
             return {}
@@ -99,9 +132,9 @@ def wait_for_file(storage, path, max_wait):
         bool: True if file exists, False otherwise
     """
     logger.info(f"Waiting for file to be created: {path}")
-    start_time = time.time()
+    deadline = time.monotonic() + max_wait
 
-    while time.time() - start_time < max_wait:
+    while time.monotonic() < deadline:
         if storage.exists(path):
             logger.info(f"File exists: {path}")
             return True
@@ -113,6 +146,49 @@ def wait_for_file(storage, path, max_wait):
     return False
 
 
+def find_missing_outputs(storage, path_manager, dates):
+    """Find the dates whose HTML, metadata or games files are missing from storage.
+
+    Lists each month/day partition prefix once instead of checking every file,
+    and only falls back to a per-file exists() check for keys the listing lacks.
+
+    Args:
+        storage: Storage interface instance
+        path_manager: DataPathManager used by the scraper
+        dates (dict): Scraped date strings (YYYY-MM-DD) mapped to their datetime objects
+
+    Returns:
+        list: Date strings (YYYY-MM-DD) with at least one missing file
+    """
+    expected = {
+        date_str: [
+            path_manager.get_html_path(date_obj),
+            path_manager.get_json_meta_path(date_obj),
+            path_manager.get_games_path(date_obj)
+        ]
+        for date_str, date_obj in dates.items()
+    }
+
+    # Paths are partitioned as .../year=YYYY/month=MM/day=DD/file, so listing
+    # the month partition covers every day in it
+    prefixes = {path.rsplit('/day=', 1)[0] + '/' for paths in expected.values() for path in paths}
+    listed = {}
+    for prefix in prefixes:
+        listed.update(storage.list_keys(prefix))
+
+    # Check any path the listing lacks directly; these HEADs are independent
+    unlisted = [path for paths in expected.values() for path in paths if path not in listed]
+    if unlisted:
+        with ThreadPoolExecutor(max_workers=min(VERIFY_WORKERS, len(unlisted))) as executor:
+            found = dict(zip(unlisted, executor.map(storage.exists, unlisted)))
+        listed.update({path: None for path, exists in found.items() if exists})
+
+    return [
+        date_str for date_str, paths in expected.items()
+        if any(path not in listed for path in paths)
+    ]
+
+
 def run_scraper(year=None, month=None, day=None, storage_type='s3', bucket_name=None,
                html_prefix='data/html', json_prefix='data/json', lookup_type='file', lookup_file='data/lookup.json',
                table_name=None, region='us-east-2', force_scrape=False, skip_wait=False, use_test_data=False,
@@ -253,7 +329,7 @@ def run_scraper(year=None, month=None, day=None, storage_type='s3', bucket_name=
         # Update lookup data
         if lookup_type == 'file':
             update_lookup_data(
-                None,  # We'll load lookup data inside the function
+                None,  # Reloaded right before writing, so updates saved during the scrape aren't lost
                 date_str,
                 success=True,
                 games_count=result.get('games_count', 0),
@@ -275,7 +351,7 @@ def run_month(year=None, month=None, storage_type='s3', bucket_name=None,
               html_prefix='data/html', json_prefix='data/json', lookup_file='data/lookup.json',
               lookup_type='file', region='us-east-2', target_days=None, table_name=None,
               force_scrape=False, use_test_data=False, max_retries=3, architecture_version='v1',
-              max_wait=300):
+              max_wait=300, max_workers=8, http_cache_dir=None, lookup=None, checkpoint=None):
     """Run the scraper for an entire month
 
     Args:
@@ -295,6 +371,12 @@ def run_month(year=None, month=None, storage_type='s3', bucket_name=None,
         max_retries (int): Maximum number of retries for a failed day
         architecture_version (str): Data architecture version ('v1' or 'v2')
         max_wait (int): Maximum seconds to wait for file creation
+        max_workers (int): Number of days fetched concurrently
+        http_cache_dir (str): Directory to cache fetched pages in, so a retried
+            month doesn't re-download them (default: no cache)
+        lookup (Lookup): Existing v1 lookup to record scraped days in, shared with
+            other months running at the same time (default: open lookup_file)
+        checkpoint (UnifiedCheckpoint): Existing v2 checkpoint, shared the same way
 
     Returns:
         dict: Result dictionary with success status and other information
@@ -305,10 +387,10 @@ def run_month(year=None, month=None, storage_type='s3', bucket_name=None,
         year = year or now.year
         month = month or now.month
 
-        logger.info(f"Running scraper for month: {year}-{month:02d}")
+        logger.info("Running scraper for month: %d-%02d", year, month)
 
         # Get the number of days in the month
-        _, num_days = monthrange(year, month)
+        num_days = _last_day(year, month)
 
         # If target_days is None, scrape all days
         if target_days is None:
@@ -322,16 +404,21 @@ def run_month(year=None, month=None, storage_type='s3', bucket_name=None,
             logger.warning(f"No valid days to scrape for {year}-{month:02d}")
             return {"success": True, "skipped": True, "month": f"{year}-{month:02d}"}
 
-        logger.info(f"Will scrape {len(target_days)} days in {year}-{month:02d}: {target_days}")
+        logger.info("Will scrape %d days in %d-%02d: %s", len(target_days), year, month, target_days)
 
         # Import the SimpleScraper to run
         from ncsoccer.scraper import SimpleScraper
 
-        # Create and run the scraper
+        # One scraper fetches every target day concurrently, sharing its HTTP
+        # session, storage and lookup between days
         scraper = SimpleScraper(
-            mode='month',
+            mode='range',
             start_year=year,
             start_month=month,
+            start_day=target_days[0],
+            end_year=year,
+            end_month=month,
+            end_day=target_days[-1],
             storage_type=storage_type,
             bucket_name=bucket_name,
             html_prefix=html_prefix,
@@ -340,27 +427,54 @@ def run_month(year=None, month=None, storage_type='s3', bucket_name=None,
             lookup_type=lookup_type,
             region=region,
             force_scrape=force_scrape,
-            target_days=target_days
+            use_test_data=use_test_data,
+            architecture_version=architecture_version,
+            max_retries=max_retries,
+            max_workers=max_workers,
+            http_cache_dir=http_cache_dir,
+            lookup=lookup,
+            checkpoint=checkpoint
         )
 
-        # Run the scraper
-        result = scraper.run()
+        # Format each day's date string once; scrape results are keyed by it
+        dates = {f"{year}-{month:02d}-{day:02d}": datetime(year, month, day) for day in target_days}
 
-        if not result.get('success', False):
-            logger.error(f"Scraper failed for month {year}-{month:02d}: {result.get('error', 'Unknown error')}")
-            return result
+        # Drop days the checkpoint/lookup already has before queueing any work
+        skipped_dates = []
+        if scraper.skip_existing:
+            skipped_dates = [date_str for date_str, date_obj in dates.items() if scraper.date_already_scraped(date_obj)]
+            for date_str in skipped_dates:
+                del dates[date_str]
+
+        if not dates:
+            logger.info("All %d target days in %d-%02d were already scraped", len(skipped_dates), year, month)
+            return {"success": True, "skipped": True, "month": f"{year}-{month:02d}", "days_skipped": len(skipped_dates)}
+
+        results = scraper.scrape_dates(list(dates.values()))
+
+        # Confirm every scraped day's files landed, with one listing per month
+        scraped = {date_str: date_obj for date_str, date_obj in dates.items() if results.get(date_str)}
+        for date_str in find_missing_outputs(scraper.storage, scraper.path_manager, scraped):
+            logger.error(f"Output files missing for {date_str}")
+            results[date_str] = False
 
         # Track results
-        processed_days = result.get('days_processed', 0)
-        total_games = result.get('games_count', 0)
+        processed_days = sum(1 for success in results.values() if success)
+        failed_dates = [date_str for date_str, success in results.items() if not success]
+        total_games = scraper.games_scraped
 
-        logger.info(f"Scraper completed for month {year}-{month:02d}")
-        logger.info(f"Processed {processed_days} days and found {total_games} games")
+        if failed_dates:
+            logger.error(f"Scraper failed for {len(failed_dates)} days in {year}-{month:02d}: {failed_dates}")
+
+        logger.info("Scraper completed for month %d-%02d", year, month)
+        logger.info("Processed %d days and found %d games", processed_days, total_games)
 
         return {
-            "success": True,
+            "success": not failed_dates,
             "month": f"{year}-{month:02d}",
             "days_processed": processed_days,
+            "days_skipped": len(skipped_dates),
+            "failed_dates": failed_dates,
             "games_count": total_games
         }
 
@@ -369,10 +483,32 @@ def run_month(year=None, month=None, storage_type='s3', bucket_name=None,
         return {"success": False, "error": str(e), "month": f"{year}-{month:02d}" if 'year' in locals() and 'month' in locals() else None}
 
 
+@lru_cache(maxsize=256)
+def _last_day(year, month):
+    """Number of days in a month, memoized across months, ranges and warm invocations"""
+    return monthrange(year, month)[1]
+
+
+def _months_between(start_dt, end_dt):
+    """Yield (year, month, first_day, last_day) for each month the date range touches.
+
+    Months are counted as integers, so only the days-in-month lookup is done per month.
+    """
+    start_index = start_dt.year * 12 + start_dt.month - 1
+    end_index = end_dt.year * 12 + end_dt.month - 1
+    for index in range(start_index, end_index + 1):
+        year, month = divmod(index, 12)
+        month += 1
+        first_day = start_dt.day if index == start_index else 1
+        last_day = end_dt.day if index == end_index else _last_day(year, month)
+        yield year, month, first_day, last_day
+
+
 def run_date_range(start_date, end_date, storage_type='s3', bucket_name=None,
                   html_prefix='data/html', json_prefix='data/json', lookup_file='data/lookup.json',
                   lookup_type='file', region='us-east-2', force_scrape=False, use_test_data=False,
-                  architecture_version='v1', max_wait=300):
+                  architecture_version='v1', max_wait=300, max_months=4, timeout=None,
+                  newest_first=False, http_cache_dir=None):
     """Run the scraper for a date range
 
     Args:
@@ -389,6 +525,13 @@ def run_date_range(start_date, end_date, storage_type='s3', bucket_name=None,
         use_test_data (bool): Whether to use test data paths
         architecture_version (str): Data architecture version ('v1' or 'v2')
         max_wait (int): Maximum seconds to wait for file creation
+        max_months (int): Number of months scraped concurrently
+        timeout (float): Seconds to wait for months to finish before returning the
+            unfinished ones as remaining_months (default: wait for all)
+        newest_first (bool): Queue the latest months first, e.g. for backfills
+        http_cache_dir (str): Directory to cache fetched pages of months before the
+            current one in, so a resumed run doesn't re-download them; the current
+            month's pages still change as scores come in (default: no cache)
 
     Returns:
         dict: Result dictionary with success status and other information
@@ -404,18 +547,27 @@ def run_date_range(start_date, end_date, storage_type='s3', bucket_name=None,
 
         logger.info(f"Running scraper for date range: {start_date} to {end_date}")
 
-        # Import the SimpleScraper to run
-        from ncsoccer.scraper import SimpleScraper
+        # Group the range's days by month so each month is one concurrent run_month batch
+        months = {
+            (year, month): list(range(first_day, last_day + 1))
+            for year, month, first_day, last_day in _months_between(start_dt, end_dt)
+        }
 
-        # Create and run the scraper
-        scraper = SimpleScraper(
-            mode='range',
-            start_year=start_dt.year,
-            start_month=start_dt.month,
-            start_day=start_dt.day,
-            end_year=end_dt.year,
-            end_month=end_dt.month,
-            end_day=end_dt.day,
+        month_items = list(months.items())
+        if newest_first:
+            month_items.reverse()
+
+        processed_days = 0
+        skipped_days = 0
+        total_games = 0
+        failed_dates = []
+        remaining_months = []
+
+        # Every save rewrites the whole lookup/checkpoint document, so months running
+        # at once must record into one shared copy; per-month copies would each
+        # overwrite the dates the others saved
+        from ncsoccer.scraper import SimpleScraper
+        state = SimpleScraper(
             storage_type=storage_type,
             bucket_name=bucket_name,
             html_prefix=html_prefix,
@@ -423,28 +575,79 @@ def run_date_range(start_date, end_date, storage_type='s3', bucket_name=None,
             lookup_file=lookup_file,
             lookup_type=lookup_type,
             region=region,
-            force_scrape=force_scrape
+            use_test_data=use_test_data,
+            architecture_version=architecture_version
         )
+        checkpoint = state.checkpoint
+        lookup = state.lookup if checkpoint is None else None
+
+        this_month = (datetime.now().year, datetime.now().month)
+
+        # Months are independent and network bound, so run a few at once
+        executor = ThreadPoolExecutor(max_workers=min(max_months, len(month_items)))
+        future_to_month = {
+            executor.submit(
+                run_month,
+                year=year,
+                month=month,
+                storage_type=storage_type,
+                bucket_name=bucket_name,
+                html_prefix=html_prefix,
+                json_prefix=json_prefix,
+                lookup_file=lookup_file,
+                lookup_type=lookup_type,
+                region=region,
+                target_days=target_days,
+                force_scrape=force_scrape,
+                use_test_data=use_test_data,
+                architecture_version=architecture_version,
+                max_wait=max_wait,
+                http_cache_dir=http_cache_dir if (year, month) < this_month else None,
+                lookup=lookup,
+                checkpoint=checkpoint
+            ): (year, month, target_days)
+            for (year, month), target_days in month_items
+        }
 
-        # Run the scraper
-        result = scraper.run()
-
-        if not result.get('success', False):
-            logger.error(f"Scraper failed for date range {start_date} to {end_date}: {result.get('error', 'Unknown error')}")
-            return result
+        try:
+            for future in as_completed(future_to_month, timeout=timeout):
+                year, month, target_days = future_to_month[future]
+                result = future.result()
+
+                if 'error' in result:
+                    logger.error(f"Scraper failed for {year}-{month:02d}: {result['error']}")
+                    failed_dates.extend(f"{year}-{month:02d}-{day:02d}" for day in target_days)
+                    continue
+
+                processed_days += result.get('days_processed', 0)
+                skipped_days += result.get('days_skipped', 0)
+                total_games += result.get('games_count', 0)
+                failed_dates.extend(result.get('failed_dates', []))
+        except TimeoutError:
+            remaining_months = sorted(
+                f"{year}-{month:02d}" for future, (year, month, _) in future_to_month.items() if not future.done()
+            )
+            logger.warning(f"Timed out after {timeout}s with {len(remaining_months)} months unfinished: {remaining_months}")
+        finally:
+            # Don't start queued months after a timeout; running ones can't be interrupted
+            executor.shutdown(wait=not remaining_months, cancel_futures=True)
 
-        # Track results
-        processed_days = result.get('days_processed', 0)
-        total_games = result.get('games_count', 0)
+        failed_dates.sort()
+        if failed_dates:
+            logger.error(f"Scraper failed for {len(failed_dates)} days in {start_date} to {end_date}: {failed_dates}")
 
         logger.info(f"Scraper completed for date range {start_date} to {end_date}")
         logger.info(f"Processed {processed_days} days and found {total_games} games")
 
         return {
-            "success": True,
+            "success": not failed_dates and not remaining_months,
             "start_date": start_date,
             "end_date": end_date,
+            "months_processed": len(month_items) - len(remaining_months),
             "days_processed": processed_days,
+            "days_skipped": skipped_days,
+            "failed_dates": failed_dates,
+            "remaining_months": remaining_months,
             "games_count": total_games
         }
 
@@ -490,7 +693,7 @@ def update_lookup_data(lookup_data, date_str, success=True, games_count=0, looku
             try:
                 # Read full lookup file
                 if storage.exists(lookup_file):
-                    data = json.loads(storage.read(lookup_file))
+                    data = orjson.loads(storage.read(lookup_file))
                 else:
                     data = {'scraped_dates': {}}
 
@@ -506,12 +709,17 @@ def update_lookup_data(lookup_data, date_str, success=True, games_count=0, looku
         else:
             # Local file system
             try:
+                if lookup_file.endswith('.db'):
+                    # Only the one row changes; no need to rewrite the rest
+                    _sqlite_lookup(lookup_file).update_date(date_str, success, games_count)
+                    return True
+
                 if not os.path.exists(os.path.dirname(lookup_file)):
                     os.makedirs(os.path.dirname(lookup_file), exist_ok=True)
 
                 if os.path.exists(lookup_file):
-                    with open(lookup_file, 'r') as f:
-                        data = json.load(f)
+                    with open(lookup_file, 'rb') as f:
+                        data = orjson.loads(f.read())
                 else:
                     data = {'scraped_dates': {}}
 
@@ -519,8 +727,7 @@ def update_lookup_data(lookup_data, date_str, success=True, games_count=0, looku
                 data['scraped_dates'] = lookup_data
 
                 # Write back to file
-                with open(lookup_file, 'w') as f:
-                    json.dump(data, f)
+                write_json_atomic(lookup_file, data)
                 return True
             except Exception as e:
                 logger.error(f"Error updating lookup file in local filesystem: {e}")
@@ -4,14 +4,17 @@
 import os
 import json
 import time
+import hashlib
 import logging
 import requests
+import threading
 from datetime import datetime, timedelta
 from bs4 import BeautifulSoup
 import re
 from typing import Dict, List, Optional, Any, Union
+from collections import OrderedDict
 import urllib.parse
-from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from dataclasses import asdict
 import traceback
 
@@ -41,6 +44,32 @@ BASE_URL = "https://nc-soccer-hudson.ezleagues.ezfacility.com"
 PRINT_URL = f"{BASE_URL}/print.aspx"
 FACILITY_ID = "690"
 
+# Dates this container has already seen scraped, keyed by the checkpoint or lookup
+# that recorded them. Warm invocations (e.g. Step Functions retries) skip these
+# without asking storage again. Only successes are cached, since another
+# invocation may scrape a missing date at any time.
+SCRAPED_CACHE_SIZE = 10000
+_scraped_cache = OrderedDict()
+_scraped_cache_lock = threading.Lock()
+
+
+def _remember_scraped(key):
+    """Record a scraped (scope, date) key, evicting the least recently used"""
+    with _scraped_cache_lock:
+        _scraped_cache[key] = True
+        _scraped_cache.move_to_end(key)
+        if len(_scraped_cache) > SCRAPED_CACHE_SIZE:
+            _scraped_cache.popitem(last=False)
+
+
+def _seen_scraped(key):
+    """Whether this container has already recorded the (scope, date) key as scraped"""
+    with _scraped_cache_lock:
+        if key in _scraped_cache:
+            _scraped_cache.move_to_end(key)
+            return True
+        return False
+
 class SimpleScraper:
     """Simple soccer schedule scraper that replaces Scrapy implementation."""
 
@@ -71,7 +100,12 @@ class SimpleScraper:
         max_workers: int = 4,
         timeout: int = 30,
         max_retries: int = 3,
-        session: Optional[requests.Session] = None
+        session: Optional[requests.Session] = None,
+        http_cache_dir: Optional[str] = None,
+        http_cache_ttl: int = 86400,
+        s3_client: Optional[Any] = None,
+        lookup: Optional[Any] = None,
+        checkpoint: Optional[Any] = None
     ):
         """Initialize the scraper.
 
@@ -102,6 +136,15 @@ class SimpleScraper:
             timeout: Request timeout in seconds
             max_retries: Maximum number of retry attempts for failed requests
             session: Optional requests.Session to use for all requests
+            http_cache_dir: Directory to cache fetched pages in, so retried runs don't
+                re-download them (default: no cache; use /tmp/... in Lambda)
+            http_cache_ttl: Seconds a cached page stays fresh
+            s3_client: Optional boto3 S3 client for S3 storage, so a warm Lambda can reuse
+                its connections across invocations
+            lookup: Optional existing lookup interface to record v1 scrape status in, so
+                scrapers running side by side update one document
+            checkpoint: Optional existing checkpoint manager to use for v2, shared in
+                the same way
         """
         # Set mode ('day' or 'range')
         self.scrape_mode = mode
@@ -141,6 +184,10 @@ class SimpleScraper:
         self.max_retries = max_retries
         self.session = session or requests.Session()
         self.max_workers = max_workers
+        self.http_cache_dir = http_cache_dir
+        self.http_cache_ttl = http_cache_ttl
+        if http_cache_dir:
+            os.makedirs(http_cache_dir, exist_ok=True)
 
         # Setup user agent and other headers
         self.session.headers.update({
@@ -209,28 +256,46 @@ class SimpleScraper:
         )
 
         # Set up storage and lookup interfaces
-        self.storage = get_storage_interface(self.config.storage_type, self.config.bucket_name, region=region)
-        self.lookup = get_lookup_interface(
-            lookup_type=lookup_type,
-            lookup_file=lookup_file,
-            region=region,
-            table_name=table_name,
-            architecture_version=architecture_version
-        )
+        self.storage = get_storage_interface(self.config.storage_type, self.config.bucket_name, region=region,
+                                             client=s3_client)
+        # The lookup is only consulted for v1; it is built on first use so v2 runs
+        # don't pay for loading it at startup
+        self._lookup = lookup
+        self._lookup_params = {
+            'lookup_type': lookup_type,
+            'lookup_file': lookup_file,
+            'region': region,
+            'table_name': table_name,
+            'architecture_version': architecture_version
+        }
 
         # Set up checkpoint manager if using v2 architecture
-        self.checkpoint = None
-        if architecture_version == 'v2':
+        self.checkpoint = checkpoint
+        if architecture_version == 'v2' and checkpoint is None:
             checkpoint_path = self.path_manager.get_checkpoint_path()
             self.checkpoint = get_checkpoint_manager(checkpoint_path, storage_interface=self.storage)
             logger.info(f"Checkpoint manager initialized for {checkpoint_path}")
 
+        # Identifies where scrape status is recorded, for the warm-container cache
+        self._scraped_scope = (
+            self.config.storage_type,
+            self.config.bucket_name,
+            self.path_manager.get_checkpoint_path() if self.checkpoint else lookup_file
+        )
+
         # Log scrape configuration
         if self.scrape_mode == 'range':
             logger.info(f"Date range scrape: {self.start_year}-{self.start_month:02d}-{self.start_day:02d} to {self.end_year}-{self.end_month:02d}-{self.end_day or 'last day'}")
         else:
             logger.info(f"Single date scrape: {self.target_year}-{self.target_month:02d}-{self.target_day:02d}")
 
+    @property
+    def lookup(self):
+        """Lookup interface for v1 scrape status, created on first access."""
+        if self._lookup is None:
+            self._lookup = get_lookup_interface(**self._lookup_params)
+        return self._lookup
+
     def date_already_scraped(self, date_obj: datetime) -> bool:
         """Check if a date has already been scraped.
 
@@ -247,17 +312,24 @@ class SimpleScraper:
             logger.info(f"Force scrape enabled, ignoring previous scrape status for {date_str}")
             return False
 
+        cache_key = (self._scraped_scope, date_str)
+        if _seen_scraped(cache_key):
+            logger.info(f"Date {date_str} already scraped by this container")
+            return True
+
         # Check checkpoint if using v2 architecture
         if self.checkpoint:
             is_scraped = self.checkpoint.is_date_scraped(date_str)
             if is_scraped:
                 logger.info(f"Date {date_str} already scraped according to checkpoint")
-            return is_scraped
+        else:
+            # Otherwise check lookup
+            is_scraped = self.lookup.is_date_scraped(date_str)
+            if is_scraped:
+                logger.info(f"Date {date_str} already scraped according to lookup")
 
-        # Otherwise check lookup
-        is_scraped = self.lookup.is_date_scraped(date_str)
         if is_scraped:
-            logger.info(f"Date {date_str} already scraped according to lookup")
+            _remember_scraped(cache_key)
         return is_scraped
 
     def get_direct_date_url(self, date_obj: datetime) -> str:
@@ -293,6 +365,18 @@ class SimpleScraper:
             HTML content of the page, or None if the request failed
         """
         url = self.get_direct_date_url(date_obj)
+
+        cache_path = None
+        if self.http_cache_dir:
+            cache_path = os.path.join(self.http_cache_dir, f"{hashlib.sha1(url.encode('utf-8')).hexdigest()}.html")
+            try:
+                if time.time() - os.path.getmtime(cache_path) < self.http_cache_ttl:
+                    with open(cache_path, 'r', encoding='utf-8') as f:
+                        logger.info(f"Using cached schedule page for {date_obj.strftime('%Y-%m-%d')}")
+                        return f.read()
+            except OSError:
+                pass  # Not cached yet
+
         logger.info(f"Fetching schedule page for {date_obj.strftime('%Y-%m-%d')} from {url}")
 
         for attempt in range(self.max_retries):
@@ -300,6 +384,8 @@ class SimpleScraper:
                 response = self.session.get(url, timeout=self.timeout)
                 if response.status_code == 200:
                     logger.info(f"Successfully fetched schedule page for {date_obj.strftime('%Y-%m-%d')}")
+                    if cache_path:
+                        self._cache_page(cache_path, response.text)
                     return response.text
                 else:
                     logger.warning(f"Failed to fetch schedule page (status {response.status_code}), attempt {attempt + 1}/{self.max_retries}")
@@ -313,6 +399,16 @@ class SimpleScraper:
         logger.error(f"Failed to fetch schedule page after {self.max_retries} attempts")
         return None
 
+    def _cache_page(self, cache_path: str, html_content: str) -> None:
+        """Store a fetched page in the HTTP cache, replacing any older copy."""
+        tmp_path = f"{cache_path}.{os.getpid()}.tmp"
+        try:
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                f.write(html_content)
+            os.replace(tmp_path, cache_path)
+        except OSError as e:
+            logger.warning(f"Could not cache page at {cache_path}: {e}")
+
     def save_html(self, date_obj: datetime, html_content: str) -> bool:
         """Save HTML content to storage.
 
@@ -547,6 +643,8 @@ class SimpleScraper:
                 # Use lookup for v1 architecture
                 self.lookup.update_date(date_str, success=success, games_count=games_count)
                 logger.info(f"Updated lookup for {date_str} with games_count={games_count}")
+            if success:
+                _remember_scraped((self._scraped_scope, date_str))
             return True
         except Exception as e:
             logger.error(f"Error updating checkpoint: {e}")
@@ -597,13 +695,15 @@ class SimpleScraper:
         logger.info(f"Successfully scraped {len(games)} games for {date_str}")
         return True
 
-    def scrape_date_range(self, start_date: datetime, end_date: datetime, parallel: bool = True) -> Dict[str, bool]:
+    def scrape_date_range(self, start_date: datetime, end_date: datetime, parallel: bool = True,
+                          timeout: Optional[float] = None) -> Dict[str, bool]:
         """Scrape data for a range of dates.
 
         Args:
             start_date: Start date
             end_date: End date
             parallel: Whether to scrape dates in parallel
+            timeout: Seconds to wait for parallel scrapes before giving up on the rest
 
         Returns:
             Dictionary mapping dates to success status
@@ -619,36 +719,66 @@ class SimpleScraper:
 
         logger.info(f"Found {len(dates)} dates to scrape")
 
-        results = {}
+        return self.scrape_dates(dates, parallel=parallel, timeout=timeout)
 
-        if parallel and len(dates) > 1:
-            # Use ThreadPoolExecutor for parallel scraping
-            with ThreadPoolExecutor(max_workers=min(self.max_workers, len(dates))) as executor:
-                # Submit all scraping tasks
-                future_to_date = {
-                    executor.submit(self.scrape_date, date): date for date in dates
-                }
+    def scrape_dates(self, dates: List[datetime], parallel: bool = True,
+                     timeout: Optional[float] = None) -> Dict[str, bool]:
+        """Scrape data for a list of dates, fetching up to max_workers pages at once.
+
+        Args:
+            dates: Dates to scrape
+            parallel: Whether to scrape dates in parallel
+            timeout: Seconds to wait for parallel scrapes; dates not finished by then
+                are left out of the results
+
+        Returns:
+            Dictionary mapping dates to success status
+        """
+        results = {}
 
-                # Collect results as they complete
-                for future in future_to_date:
-                    date = future_to_date[future]
+        # Save checkpoint/lookup updates in batches rather than rewriting them after every date
+        status = self.lookup if self.checkpoint is None else self.checkpoint
+        with status.batched():
+            if parallel and len(dates) > 1:
+                # Fetching is network bound, so keep several requests in flight at once
+                executor = ThreadPoolExecutor(max_workers=min(self.max_workers, len(dates)))
+                try:
+                    # Submit all scraping tasks
+                    future_to_date = {
+                        executor.submit(self.scrape_date, date): date for date in dates
+                    }
+
+                    # Collect results as they complete
+                    for future in as_completed(future_to_date, timeout=timeout):
+                        date = future_to_date[future]
+                        date_str = date.strftime('%Y-%m-%d')
+                        try:
+                            success = future.result()
+                            results[date_str] = success
+                        except Exception as e:
+                            logger.error(f"Error scraping {date_str}: {e}")
+                            results[date_str] = False
+                except TimeoutError:
+                    logger.warning(f"Timed out after {timeout}s with {len(dates) - len(results)} dates unfinished")
+                finally:
+                    # Don't start queued dates after a timeout; running ones can't be interrupted
+                    executor.shutdown(wait=len(results) == len(dates), cancel_futures=True)
+            else:
+                # Scrape dates sequentially
+                for date in dates:
                     date_str = date.strftime('%Y-%m-%d')
                     try:
-                        success = future.result()
+                        success = self.scrape_date(date)
                         results[date_str] = success
                     except Exception as e:
                         logger.error(f"Error scraping {date_str}: {e}")
                         results[date_str] = False
-        else:
-            # Scrape dates sequentially
-            for date in dates:
-                date_str = date.strftime('%Y-%m-%d')
-                try:
-                    success = self.scrape_date(date)
-                    results[date_str] = success
-                except Exception as e:
-                    logger.error(f"Error scraping {date_str}: {e}")
-                    results[date_str] = False
+
+        # A date whose checkpoint/lookup update couldn't be saved, e.g. because other
+        # writers kept winning, would be scraped again next run; report it as failed
+        for date_str in set(status.get_unsaved_dates()) & results.keys():
+            logger.error(f"Scrape status for {date_str} was not saved")
+            results[date_str] = False
 
         # Calculate success ratio
         success_count = sum(1 for success in results.values() if success)
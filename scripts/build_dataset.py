@@ -199,7 +199,14 @@ def main():
         
         # Save to Parquet
         print(f"Saving dataset with {len(combined_df)} records to {args.output}")
-        combined_df.to_parquet(args.output, index=False)
+        table = pa.Table.from_pandas(combined_df, preserve_index=False)
+        pq.write_table(
+            table,
+            args.output,
+            compression='zstd',
+            use_dictionary=[name for name in ('home_team', 'away_team', 'league') if name in table.column_names],
+            data_page_size=1 << 20
+        )
         
         # Also save a CSV for easy viewing
         combined_df.to_csv(args.output.replace('.parquet', '.csv'), index=False)
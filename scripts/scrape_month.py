@@ -3,20 +3,16 @@
 Month Scraper for NC Soccer
 
 This script handles scraping a full month's worth of games data.
-It runs parallel scrapers for each day of the month to improve efficiency.
+It scrapes the days of the month concurrently in a single process.
 """
 
-import os
 import sys
 import json
 import logging
 import calendar
 import argparse
-import subprocess
 from pathlib import Path
 from datetime import datetime
-from concurrent.futures import ThreadPoolExecutor, as_completed
-import multiprocessing
 
 # Set up logging
 logging.basicConfig(
@@ -31,6 +27,11 @@ def setup_environment(repo_root=None):
     if repo_root is None:
         repo_root = Path(__file__).parent.parent.absolute()
     
+    # Add the scraping directory to the Python path
+    scraping_path = repo_root / "scraping"
+    if str(scraping_path) not in sys.path:
+        sys.path.insert(0, str(scraping_path))
+    
     # Create output directories
     data_dir = repo_root / "output" / "data"
     html_dir = data_dir / "html"
@@ -50,54 +51,34 @@ def scrape_month(year, month, force_scrape=False):
     
     logger.info(f"Starting month scrape for {year}-{month}, {days_in_month} days to process")
     
-    # Define how many days to process in parallel (adjust based on your system)
-    max_workers = min(multiprocessing.cpu_count(), 4)  # Use at most 4 cores
-    
-    # Create a list to store results
-    successful_days = 0
-    
-    # Get the path to the helper script
-    helper_script = os.path.join(repo_root, 'scripts', 'scrape_single_day.py')
-    
-    # Process days using ThreadPoolExecutor for parallelism
-    with ThreadPoolExecutor(max_workers=max_workers) as executor:
-        # Submit all tasks
-        future_to_day = {}
-        for day_of_month in range(1, days_in_month + 1):
-            cmd = [
-                sys.executable, helper_script,
-                '--year', str(year),
-                '--month', str(month),
-                '--day', str(day_of_month)
-            ]
-            
-            if force_scrape:
-                cmd.append('--force-scrape')
-            
-            logger.info(f"Submitting day {day_of_month} for processing")
-            future = executor.submit(subprocess.run, cmd, 
-                                    capture_output=True, text=True, check=False)
-            future_to_day[future] = day_of_month
-        
-        # Process results as they complete
-        for future in as_completed(future_to_day):
-            day_of_month = future_to_day[future]
-            try:
-                result = future.result()
-                if result.returncode == 0:
-                    logger.info(f"Successfully processed day {day_of_month}")
-                    successful_days += 1
-                else:
-                    logger.error(f"Failed to process day {day_of_month}: {result.stderr}")
-            except Exception as e:
-                logger.error(f"Exception processing day {day_of_month}: {e}")
+    # Scrape every day in this process; run_month fetches several days at once
+    # over a shared HTTP session instead of starting a Python process per day
+    from ncsoccer.runner import run_month
+
+    result = run_month(
+        year=year,
+        month=month,
+        storage_type='file',
+        html_prefix=str(data_dir),
+        json_prefix=str(json_dir),
+        lookup_file=str(data_dir / "lookup.json"),
+        force_scrape=force_scrape,
+        architecture_version='v2'
+    )
+
+    if result.get('error'):
+        logger.error(f"Month scrape failed: {result['error']}")
+    for date_str in result.get('failed_dates', []):
+        logger.error(f"Failed to process {date_str}")
+
+    successful_days = result.get('days_processed', 0)
     
     # Summarize results
     logger.info(f"Month scraping complete. Successfully processed {successful_days} of {days_in_month} days.")
     
     # Check if any JSON files were created
-    json_files = list(json_dir.glob(f"{year}-{month:02d}-*.json"))
-    html_files = list(html_dir.glob(f"{year}-{month:02d}-*.html"))
+    json_files = list(data_dir.rglob(f"{year}-{month:02d}-*_games.jsonl"))
+    html_files = list(data_dir.rglob(f"{year}-{month:02d}-*.html"))
     
     logger.info(f"Generated {len(html_files)} HTML files and {len(json_files)} JSON files")
     
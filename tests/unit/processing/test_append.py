@@ -1,4 +1,7 @@
+import csv
+import io
 import pandas as pd
+import pyarrow as pa
 import pytest
 from io import BytesIO
 from unittest.mock import patch, MagicMock
@@ -72,11 +75,8 @@ def new_data():
         }
     ])
 
-@patch('processing.lambda_function.boto3.client')
-def test_get_existing_dataset(mock_boto3_client, existing_data):
-    # Mock S3 client
-    mock_s3 = MagicMock()
-    mock_boto3_client.return_value = mock_s3
+@patch('processing.lambda_function._S3')
+def test_get_existing_dataset(mock_s3, existing_data):
 
     # Mock S3 response
     parquet_buffer = BytesIO()
@@ -91,49 +91,88 @@ def test_get_existing_dataset(mock_boto3_client, existing_data):
     result = lambda_function.get_existing_dataset('test-bucket', 'test-key')
 
     # Verify the result
-    assert len(result) == 2
-    assert result.iloc[0]['home_team'] == 'Team A'
-    assert result.iloc[1]['home_team'] == 'Team C'
-
-@patch('processing.lambda_function.get_existing_dataset')
-def test_data_appending_and_deduplication(mock_get_existing_dataset, existing_data, new_data):
-    # Mock the get_existing_dataset function
-    mock_get_existing_dataset.return_value = existing_data
-
-    # Create a test event with validated data
-    validated_data = new_data.to_dict('records')
-
-    # Create mock S3 client for convert_to_parquet
-    with patch('processing.lambda_function.boto3.client') as mock_boto3_client:
-        mock_s3 = MagicMock()
-        mock_boto3_client.return_value = mock_s3
-
-        # Call the relevant part of the function manually
-        existing_df = existing_data
-        new_df = pd.DataFrame(validated_data)
-
-        # Apply the same logic as in the function
-        if not new_df.empty and not existing_df.empty:
-            existing_df['composite_key'] = existing_df.apply(
-                lambda x: f"{x['date']}_{x['home_team']}_{x['away_team']}_{x['league']}", axis=1
-            )
-            new_df['composite_key'] = new_df.apply(
-                lambda x: f"{x['date']}_{x['home_team']}_{x['away_team']}_{x['league']}", axis=1
-            )
-
-            combined_df = pd.concat([existing_df, new_df])
-            combined_df = combined_df.sort_values('timestamp', ascending=False)
-            combined_df = combined_df.drop_duplicates(subset='composite_key', keep='first')
-            combined_df = combined_df.drop(columns=['composite_key'])
-
-        # Verify results
-        assert len(combined_df) == 3  # Should have 3 records after deduplication
-
-        # Check that the updated record was kept
-        updated_record = combined_df[combined_df['home_team'] == 'Team C'].iloc[0]
-        assert updated_record['url'] == 'http://example.com/game2-updated'
-        assert updated_record['headers'] == 'headers2-updated'
-
-        # Check that the new record was added
-        new_record = combined_df[combined_df['home_team'] == 'Team E'].iloc[0]
-        assert new_record['away_team'] == 'Team F'
\ No newline at end of file
+    assert result.num_rows == 2
+    assert result.schema == lambda_function.DATASET_SCHEMA
+    assert result['home_team'].to_pylist() == ['Team A', 'Team C']
+
+def test_data_appending_and_deduplication(existing_data, new_data):
+    existing_table = pa.Table.from_pandas(existing_data, preserve_index=False)
+    new_table = pa.Table.from_pandas(new_data, preserve_index=False)
+
+    # convert_to_parquet combines the existing and new rows on these keys
+    combined_df = lambda_function.deduplicate_latest(
+        pa.concat_tables([existing_table, new_table]),
+        ['date', 'home_team', 'away_team', 'league']
+    ).to_pandas()
+
+    # Verify results
+    assert len(combined_df) == 3  # Should have 3 records after deduplication
+
+    # Check that the untouched existing record was kept
+    assert combined_df[combined_df['home_team'] == 'Team A'].iloc[0]['url'] == 'http://example.com/game1'
+
+    # Check that the updated record was kept
+    updated_record = combined_df[combined_df['home_team'] == 'Team C'].iloc[0]
+    assert updated_record['url'] == 'http://example.com/game2-updated'
+    assert updated_record['headers'] == 'headers2-updated'
+
+    # Check that the new record was added
+    new_record = combined_df[combined_df['home_team'] == 'Team E'].iloc[0]
+    assert new_record['away_team'] == 'Team F'
+
+
+def test_deduplicate_latest_keeps_newest_row(existing_data, new_data):
+    combined_table = pa.Table.from_pandas(
+        pd.concat([existing_data, new_data], ignore_index=True),
+        preserve_index=False
+    )
+
+    # 'field' is not in these files, so only the remaining key columns are used
+    result = lambda_function.deduplicate_latest(
+        combined_table,
+        ['date', 'field', 'home_team', 'away_team', 'time']
+    ).to_pandas()
+
+    assert len(result) == 3
+    updated_record = result[result['home_team'] == 'Team C'].iloc[0]
+    assert updated_record['url'] == 'http://example.com/game2-updated'
+    assert updated_record['headers'] == 'headers2-updated'
+
+
+def read_csv_rows(text):
+    return list(csv.reader(io.StringIO(text)))
+
+
+def test_write_csv_matches_published_format(existing_data):
+    existing_data.loc[0, 'league'] = 'League 1, Division A'
+    table = pa.Table.from_pandas(existing_data, preserve_index=False)
+
+    rows = read_csv_rows(lambda_function.write_csv(table).getvalue().decode('utf-8'))
+
+    assert rows[0] == [
+        'date', 'home_team', 'away_team', 'home_score', 'away_score', 'league',
+        'time', 'url', 'type', 'status', 'headers', 'timestamp'
+    ]
+    assert rows[1] == [
+        '2024-01-01', 'Team A', 'Team B', '3', '1', 'League 1, Division A', '14:00',
+        'http://example.com/game1', 'regular', '1.0', 'headers1', '2024-01-01 15:00:00'
+    ]
+    # The old pandas writer produced the same values
+    assert rows == read_csv_rows(existing_data.to_csv(index=False))
+
+
+def test_write_csv_keeps_pandas_format_for_null_ints_and_sub_second_times(existing_data):
+    table = pa.Table.from_pandas(existing_data, preserve_index=False)
+    table = table.set_column(3, 'home_score', pa.array([3, None], pa.int64()))
+    table = table.set_column(
+        11, 'timestamp',
+        pa.array([pd.Timestamp('2024-01-01 15:00:00.123456'), None], pa.timestamp('ns'))
+    )
+    table = table.set_column(0, 'date', pa.array([pd.Timestamp('2024-01-01 18:30'), pd.Timestamp('2024-01-02')]))
+
+    rows = read_csv_rows(lambda_function.write_csv(table).getvalue().decode('utf-8'))
+
+    assert [row[3] for row in rows[1:]] == ['3.0', '']
+    assert [row[11] for row in rows[1:]] == ['2024-01-01 15:00:00.123456', '']
+    assert [row[0] for row in rows[1:]] == ['2024-01-01 18:30:00', '2024-01-02 00:00:00']
+    assert rows == read_csv_rows(table.to_pandas().to_csv(index=False))
@@ -29,8 +29,8 @@ def test_list_json_files_excludes_meta_json():
         'Body': io.BytesIO(json.dumps({'timestamp': '2025-04-01T00:00:00Z'}).encode())
     }
 
-    # Patch boto3.client to return our mock
-    with patch('processing.lambda_function.boto3.client', return_value=mock_s3_client):
+    # Patch the module-level S3 client with our mock
+    with patch('processing.lambda_function._S3', mock_s3_client):
         # Call the list_json_files function
         files = lambda_function.list_json_files('test-bucket', 'v2/processed/json/', only_recent=False)
 
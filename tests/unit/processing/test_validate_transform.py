@@ -1,6 +1,15 @@
 import pytest
-from processing.lambda_function import validate_and_transform_data
+import pyarrow as pa
+from processing.lambda_function import (
+    validate_and_transform_data,
+    standardize_games_table,
+    transform_games_table,
+    validate_to_table,
+    read_json_table,
+    DATASET_SCHEMA,
+)
 from datetime import datetime, timezone
+from processing.models import Game
 
 def test_validate_transform_alternative_format():
     """Test that validate_and_transform_data can handle the alternative format with league_name and game_date."""
@@ -104,4 +113,88 @@ def test_validate_transform_malformed_score():
     # Check score fields are None due to parsing failure
     record = result[0]
     assert record["home_score"] is None
-    assert record["away_score"] is None
\ No newline at end of file
+    assert record["away_score"] is None
+
+def test_transform_games_table_splits_valid_and_rejected_rows():
+    """Test that the vectorized transform keeps valid rows and hands back the rest."""
+    raw_table = pa.Table.from_pylist([
+        {
+            "league_name": "Cleveland Select Spring 2025",
+            "game_date": "2025-02-15",
+            "home_team": " Hudson United Tall Ships DB ",
+            "away_team": "Cleveland Select U8",
+            "score": "7 - 2",
+            "game_time": "10:00 AM"
+        },
+        {
+            "league_name": "Cleveland Select Spring 2025",
+            "game_date": "Sat-Jun 1",  # Needs the Pydantic date parser
+            "home_team": "Hudson United",
+            "away_team": "Cleveland Select U9",
+            "score": "not a score",
+            "game_time": "11:00 AM"
+        },
+        {
+            "league_name": "Cleveland Select Spring 2025",
+            "game_date": "2025-02-15",
+            "home_team": "",  # Missing team name
+            "away_team": "Cleveland Select U10",
+            "score": "",
+            "game_time": "12:00 PM"
+        }
+    ])
+
+    valid_table, rejected_table = transform_games_table(standardize_games_table(raw_table))
+
+    assert valid_table.num_rows == 1
+    record = valid_table.to_pylist()[0]
+    assert record["date"] == datetime(2025, 2, 15)
+    assert record["home_team"] == "Hudson United Tall Ships DB"
+    assert record["home_score"] == 7
+    assert record["away_score"] == 2
+    assert record["league"] == "Cleveland Select Spring 2025"
+    assert isinstance(record["timestamp"], datetime)
+
+    # Rejected rows can still be recovered through the Pydantic models
+    assert rejected_table.num_rows == 2
+    rescued = validate_and_transform_data(rejected_table.to_pylist())
+    assert len(rescued) == 1
+    assert rescued[0]["away_team"] == "Cleveland Select U9"
+    assert rescued[0]["home_score"] is None
+
+    rescued_table = validate_to_table(rejected_table.to_pylist())
+    assert rescued_table.schema == DATASET_SCHEMA
+    assert rescued_table.num_rows == 1
+    assert rescued_table["away_team"].to_pylist() == ["Cleveland Select U9"]
+    assert rescued_table["date"].to_pylist() == [rescued[0]["date"]]
+
+def test_read_json_table_keeps_non_iso_dates_in_jsonl():
+    """Test that a JSON Lines file with a non-ISO date is read, not dropped."""
+    data = (
+        b'{"league_name": "Summer League", "game_date": "2025-06-01", "home_team": "Team A", '
+        b'"away_team": "Team B", "score": "3 - 1", "game_time": "10:00 AM"}\n'
+        b'{"league_name": "Summer League", "game_date": "Sat-Jun 1", "home_team": "Team C", '
+        b'"away_team": "Team D", "score": "2 - 2", "game_time": "11:00 AM"}\n'
+    )
+
+    table = read_json_table(data)
+    assert table.num_rows == 2
+    assert table["game_date"].to_pylist() == ["2025-06-01", "Sat-Jun 1"]
+
+    # The ISO row passes the vectorized checks and the other is left for the models
+    valid_table, rejected_table = transform_games_table(standardize_games_table(table))
+    assert valid_table["home_team"].to_pylist() == ["Team A"]
+    assert valid_table["date"].to_pylist() == [datetime(2025, 6, 1)]
+    assert rejected_table["home_team"].to_pylist() == ["Team C"]
+
+def test_game_strips_only_team_and_league_names():
+    """Test that Game trims team and league names but leaves other strings as scraped."""
+    game = Game(home_team=" Team A ", away_team="Team B ", league=" League 1", time=" 10:00 AM ")
+
+    assert game.home_team == "Team A"
+    assert game.away_team == "Team B"
+    assert game.league == "League 1"
+    assert game.time == " 10:00 AM "
+
+    with pytest.raises(ValueError):
+        Game(home_team="   ", away_team="Team B", league="League 1")
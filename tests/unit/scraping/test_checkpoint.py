@@ -0,0 +1,57 @@
+import json
+from ncsoccer.pipeline.checkpoint import UnifiedCheckpoint
+from ncsoccer.pipeline.config import FileStorage
+
+def test_checkpoint_batched_saves_every_flush_every(tmp_path):
+    """Test UnifiedCheckpoint.batched() saves periodically, not only on exit"""
+    checkpoint_file = tmp_path / "checkpoint.json"
+    checkpoint = UnifiedCheckpoint(str(checkpoint_file))
+    checkpoint.flush_every = 2
+
+    def saved_dates():
+        with open(checkpoint_file) as f:
+            return set(json.load(f)["scraping"]["completed_dates"])
+
+    with checkpoint.batched():
+        checkpoint.update_scraping("2024-03-01", games_count=1)
+        assert saved_dates() == set()
+        checkpoint.update_scraping("2024-03-02", games_count=2)
+        assert saved_dates() == {"2024-03-01", "2024-03-02"}
+        checkpoint.update_scraping("2024-03-03", games_count=3)
+        assert saved_dates() == {"2024-03-01", "2024-03-02"}
+
+    assert saved_dates() == {"2024-03-01", "2024-03-02", "2024-03-03"}
+
+def test_checkpoint_save_merges_dates_saved_by_other_writers(tmp_path):
+    """Test checkpoints loaded side by side, like fan-out Lambdas, keep each other's dates"""
+    checkpoint_file = str(tmp_path / "checkpoint.json")
+    first = UnifiedCheckpoint(checkpoint_file, storage_interface=FileStorage())
+    second = UnifiedCheckpoint(checkpoint_file, storage_interface=FileStorage())
+
+    first.update_scraping("2024-03-01", games_count=1)
+    second.update_scraping("2024-03-02", games_count=2)
+
+    with open(checkpoint_file) as f:
+        assert set(json.load(f)["scraping"]["completed_dates"]) == {"2024-03-01", "2024-03-02"}
+
+def test_checkpoint_reports_dates_it_could_not_save(tmp_path):
+    """Test a save that keeps losing to other writers fails and is retried on flush"""
+    class ContendedStorage(FileStorage):
+        contended = True
+
+        def write_versioned(self, path, content, version):
+            return not self.contended and super().write_versioned(path, content, version)
+
+    storage = ContendedStorage()
+    checkpoint = UnifiedCheckpoint(str(tmp_path / "checkpoint.json"), storage_interface=storage)
+    checkpoint.save_timeout = 0
+
+    with checkpoint.batched():
+        checkpoint.update_scraping("2024-03-01", games_count=1)
+    assert checkpoint.get_unsaved_dates() == ["2024-03-01"]
+
+    storage.contended = False
+    assert checkpoint.flush()
+    assert checkpoint.get_unsaved_dates() == []
+    with open(tmp_path / "checkpoint.json") as f:
+        assert "2024-03-01" in json.load(f)["scraping"]["completed_dates"]
@@ -2,7 +2,7 @@ import subprocess
 import sys
 from pathlib import Path
 
-def test_runner_basic_functionality():
+def test_runner_basic_functionality(tmp_path):
     """Test that runner works with basic parameters"""
     # Get the path to the runner script
     runner_path = Path(__file__).parents[3] / "scraping" / "ncsoccer" / "runner.py"
@@ -10,7 +10,8 @@ def test_runner_basic_functionality():
     # Make sure the runner exists
     assert runner_path.exists(), f"Runner script not found at {runner_path}"
 
-    # Run the scraper with basic parameters
+    # Run the scraper with basic parameters, from tmp_path so its lookup and
+    # data files stay out of the repository
     result = subprocess.run([
         sys.executable,
         str(runner_path),
@@ -20,7 +21,7 @@ def test_runner_basic_functionality():
         '--mode', 'day',
         '--storage-type', 'file',
         '--lookup-type', 'file'
-    ], capture_output=True, text=True)
+    ], capture_output=True, text=True, cwd=tmp_path)
 
     # Check that there is no time variable scope error
     # The script might fail for other reasons (like not finding spiders in test environment)
@@ -2,7 +2,7 @@ import os
 import json
 import pytest
 from datetime import datetime
-from ncsoccer.pipeline.lookup import LocalFileLookup, get_lookup_interface
+from ncsoccer.pipeline.lookup import LocalFileLookup, SQLiteLookup, get_lookup_interface
 
 def test_local_file_lookup(tmp_path):
     """Test LocalFileLookup functionality"""
@@ -33,4 +33,63 @@ def test_get_lookup_interface(tmp_path):
 
     # Test invalid type
     with pytest.raises(ValueError):
-        get_lookup_interface("invalid")
\ No newline at end of file
+        get_lookup_interface("invalid")
+
+def test_sqlite_lookup_migrates_json(tmp_path):
+    """Test SQLiteLookup imports an existing JSON lookup and persists updates"""
+    json_lookup = LocalFileLookup(lookup_file=str(tmp_path / "lookup.json"))
+    json_lookup.update_date("2024-03-01", success=True, games_count=5)
+    json_lookup.update_date("2024-03-02", success=False)
+
+    db_file = str(tmp_path / "lookup.db")
+    lookup = get_lookup_interface("file", lookup_file=db_file)
+    assert isinstance(lookup, SQLiteLookup)
+    assert lookup.is_date_scraped("2024-03-01")
+    assert not lookup.is_date_scraped("2024-03-02")
+    assert not lookup.is_date_scraped("2024-03-03")
+
+    lookup.update_date("2024-03-03", success=True, games_count=2)
+    reopened = SQLiteLookup(lookup_file=db_file)
+    assert reopened.is_date_scraped("2024-03-03")
+    assert reopened.scraped_dates["2024-03-01"]["games_count"] == 5
+
+def test_local_file_lookup_batched_saves_on_exit(tmp_path):
+    """Test batched() holds updates in memory until the block exits"""
+    lookup_file = tmp_path / "test_lookup.json"
+    lookup = LocalFileLookup(lookup_file=str(lookup_file))
+
+    with lookup.batched():
+        lookup.update_date("2024-03-01", success=True, games_count=5)
+        assert lookup.is_date_scraped("2024-03-01")
+        with open(lookup_file) as f:
+            assert json.load(f)["scraped_dates"] == {}
+
+    with open(lookup_file) as f:
+        assert json.load(f)["scraped_dates"]["2024-03-01"]["games_count"] == 5
+
+def test_local_file_lookup_overlapping_batches_keep_all_dates(tmp_path):
+    """Test a lookup shared by overlapping batched() blocks saves every block's dates"""
+    lookup_file = tmp_path / "test_lookup.json"
+    lookup = LocalFileLookup(lookup_file=str(lookup_file))
+
+    with lookup.batched():
+        with lookup.batched():
+            lookup.update_date("2024-03-01", success=True, games_count=1)
+        lookup.update_date("2024-04-01", success=True, games_count=2)
+
+    with open(lookup_file) as f:
+        assert set(json.load(f)["scraped_dates"]) == {"2024-03-01", "2024-04-01"}
+
+def test_sqlite_lookup_migrates_json_only_once(tmp_path):
+    """Test an existing database doesn't re-import the JSON lookup on every open"""
+    json_lookup = LocalFileLookup(lookup_file=str(tmp_path / "lookup.json"))
+    json_lookup.update_date("2024-03-01", success=True, games_count=5)
+
+    db_file = str(tmp_path / "lookup.db")
+    SQLiteLookup(lookup_file=db_file).close()
+    json_lookup.update_date("2024-03-02", success=True, games_count=1)
+
+    lookup = SQLiteLookup(lookup_file=db_file)
+    assert lookup.is_date_scraped("2024-03-01")
+    assert not lookup.is_date_scraped("2024-03-02")
+    lookup.close()